@@ -2,10 +2,24 @@
 """
 Resume PDF Generator using ReportLab
 Supports multiple styles: modern, classic, minimal
+Also renders DOCX and HTML from the same parsed resume (see RENDERERS)
 """
+import os
 import sys
 import json
+import time
+import argparse
+import cProfile
+import pstats
+import tempfile
+import tracemalloc
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from functools import cached_property
+from itertools import islice
 from pathlib import Path
+from reportlab import rl_config
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -15,37 +29,14 @@ from reportlab.platypus import (
     HRFlowable, ListFlowable, ListItem
 )
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-
-# Try to register Chinese fonts - search multiple possible paths
-CHINESE_FONT = 'Helvetica'
-CHINESE_FONT_BOLD = 'Helvetica-Bold'
-
-FONT_PATHS = [
-    # Linux paths
-    '/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc',
-    '/usr/share/fonts/truetype/wqy/wqy-microhei.ttc',
-    '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
-    '/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc',
-    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
-    # More Linux paths
-    '/usr/share/fonts/truetype/arphic/uming.ttc',
-    '/usr/share/fonts/truetype/arphic/ukai.ttc',
-    # Noto fonts (commonly available)
-    '/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc',
-    '/usr/share/fonts/google-noto-cjk/NotoSansCJK-Regular.ttc',
-]
-
-for font_path in FONT_PATHS:
-    if Path(font_path).exists():
-        try:
-            pdfmetrics.registerFont(TTFont('ChineseFont', font_path))
-            CHINESE_FONT = 'ChineseFont'
-            CHINESE_FONT_BOLD = 'ChineseFont'  # Same font for bold (will simulate with style)
-            break
-        except Exception:
-            continue
+from resume_cache import DEFAULT_MAX_BYTES, RenderCache
+from resume_docx import render_docx
+from resume_html import render_html
+from resume_model import ResumeValidationError, parse_resume
+from resume_fonts import DEFAULT_FONT, font_for, font_identity, font_runs_markup, get_cjk_font, has_chinese
+
+# Bump whenever a change alters the rendered output, to invalidate render caches
+GENERATOR_VERSION = '4'
 
 # Color schemes for different styles
 STYLES = {
@@ -73,311 +64,631 @@ STYLES = {
 }
 
 
+# Custom themes registered at runtime, mapped to the built-in layout they reuse
+_THEME_LAYOUTS = {}
+
+# Shared style sheets keyed by (theme, font, fit level); treat them as read-only
+_STYLE_SHEETS = {}
+
+# Progressively tighter layouts tried by fit-to-pages mode: spacing and font
+# scale factors, and a cap on highlights per job/project (None: keep all)
+FIT_LEVELS = (
+    {'space': 1.0, 'font': 1.0, 'highlights': None},
+    {'space': 0.6, 'font': 1.0, 'highlights': None},
+    {'space': 0.5, 'font': 0.92, 'highlights': None},
+    {'space': 0.4, 'font': 0.88, 'highlights': 4},
+    {'space': 0.3, 'font': 0.85, 'highlights': 3},
+    {'space': 0.3, 'font': 0.82, 'highlights': 2},
+)
+
+# Frame padding SimpleDocTemplate puts inside the page margins
+_FRAME_PADDING = 6
+
+# Tolerance Frame allows when checking that a flowable fits
+_FIT_FUZZ = 1e-6
+
+
+def register_theme(name: str, palette: dict, layout: str = 'modern'):
+    """Register a color theme at runtime.
+
+    ``palette`` needs the same keys as the built-in entries in STYLES
+    (primary, secondary, text, light, accent); ``layout`` picks which
+    built-in style's alignment and dividers the theme uses.
+    """
+    missing = {'primary', 'secondary', 'text', 'light', 'accent'} - palette.keys()
+    if missing:
+        raise ValueError(f"Theme '{name}' is missing colors: {', '.join(sorted(missing))}")
+    if layout not in ('modern', 'classic', 'minimal'):
+        raise ValueError(f"Unknown layout '{layout}'")
+    STYLES[name] = {
+        key: colors.HexColor(value) if isinstance(value, str) else value
+        for key, value in palette.items()
+    }
+    _THEME_LAYOUTS[name] = layout
+    for key in [k for k in _STYLE_SHEETS if k[0] == name]:
+        del _STYLE_SHEETS[key]
+
+
+def theme_layout(style: str) -> str:
+    """Return the built-in layout name a theme renders with"""
+    return _THEME_LAYOUTS.get(style, style)
+
+
+def _build_style_sheet(palette: dict, layout: str, font: str):
+    """Setup paragraph styles with Chinese font support"""
+    sheet = getSampleStyleSheet()
+
+    # Name style
+    sheet.add(ParagraphStyle(
+        'Name',
+        parent=sheet['Heading1'],
+        fontName=font,
+        fontSize=24,
+        textColor=palette['primary'],
+        spaceAfter=2*mm,
+        alignment=TA_CENTER if layout == 'modern' else TA_LEFT,
+    ))
+
+    # Title style
+    sheet.add(ParagraphStyle(
+        'Title2',
+        parent=sheet['Normal'],
+        fontName=font,
+        fontSize=12,
+        textColor=palette['light'],
+        spaceAfter=3*mm,
+        alignment=TA_CENTER if layout == 'modern' else TA_LEFT,
+    ))
+
+    # Section header
+    sheet.add(ParagraphStyle(
+        'SectionHeader',
+        parent=sheet['Heading2'],
+        fontName=font,
+        fontSize=14,
+        textColor=palette['primary'],
+        spaceBefore=5*mm,
+        spaceAfter=3*mm,
+        borderPadding=(0, 0, 2, 0),
+    ))
+
+    # Company/Institution
+    sheet.add(ParagraphStyle(
+        'Company',
+        parent=sheet['Normal'],
+        fontName=font,
+        fontSize=11,
+        textColor=palette['text'],
+    ))
+
+    # Job title
+    sheet.add(ParagraphStyle(
+        'JobTitle',
+        parent=sheet['Normal'],
+        fontName=font,
+        fontSize=10,
+        textColor=palette['secondary'],
+    ))
+
+    # Date style
+    sheet.add(ParagraphStyle(
+        'Date',
+        parent=sheet['Normal'],
+        fontName=font,
+        fontSize=9,
+        textColor=palette['light'],
+        alignment=TA_RIGHT,
+    ))
+
+    # Bullet point (replaces the sample sheet's own 'Bullet' style)
+    del sheet.byName['Bullet']
+    sheet.add(ParagraphStyle(
+        'Bullet',
+        parent=sheet['Normal'],
+        fontName=font,
+        fontSize=10,
+        textColor=palette['text'],
+        leftIndent=5*mm,
+        spaceBefore=1*mm,
+    ))
+
+    # Contact info
+    sheet.add(ParagraphStyle(
+        'Contact',
+        parent=sheet['Normal'],
+        fontName=font,
+        fontSize=9,
+        textColor=palette['light'],
+        alignment=TA_CENTER if layout == 'modern' else TA_LEFT,
+    ))
+
+    # Summary
+    sheet.add(ParagraphStyle(
+        'Summary',
+        parent=sheet['Normal'],
+        fontName=font,
+        fontSize=10,
+        textColor=palette['text'],
+        spaceAfter=3*mm,
+        leading=14,
+    ))
+
+    return sheet
+
+
+def _tighten_style_sheet(sheet, level: dict):
+    """Scale the resume styles' font sizes and vertical spacing in place"""
+    for name in ('Name', 'Title2', 'SectionHeader', 'Company', 'JobTitle',
+                 'Date', 'Bullet', 'Contact', 'Summary'):
+        style = sheet[name]
+        style.fontSize *= level['font']
+        style.leading *= level['font']
+        style.spaceBefore *= level['space']
+        style.spaceAfter *= level['space']
+
+
+def get_style_sheet(style: str, font: str, fit_level: int = 0):
+    """Return the shared style sheet for a theme, font and fit level, building it once"""
+    key = (style, font, fit_level)
+    sheet = _STYLE_SHEETS.get(key)
+    if sheet is None:
+        palette = STYLES.get(style, STYLES['modern'])
+        sheet = _build_style_sheet(palette, theme_layout(style), font)
+        if fit_level:
+            _tighten_style_sheet(sheet, FIT_LEVELS[fit_level])
+        _STYLE_SHEETS[key] = sheet
+    return sheet
+
+
+def count_pages(elements: list, width: float, height: float) -> int:
+    """Paginate flowables the way a Frame does, using only wrap() and split().
+
+    Nothing is drawn, so this is much cheaper than ``doc.build``. Like
+    ``Frame._add``, a flowable's space before overlaps the previous one's
+    space after (rl_config.overlapAttachedSpace), so only the larger gap
+    counts. Keep-with-next chains are ignored; resume content has none.
+    """
+    overlap = rl_config.overlapAttachedSpace
+    pages, remaining, prev_after, at_top = 1, height, 0.0, True
+    pending = list(elements)
+    while pending:
+        flowable = pending.pop(0)
+        before = 0.0
+        if not at_top:
+            before = flowable.getSpaceBefore()
+            if overlap:
+                if getattr(flowable, '_SPACETRANSFER', False):
+                    before = prev_after
+                before = max(before - prev_after, 0.0)
+        available = remaining - before
+        if available > 0:
+            _, h = flowable.wrap(width, available)
+            if h + before <= remaining + _FIT_FUZZ:
+                after = flowable.getSpaceAfter()
+                if before + h + after:
+                    at_top = False
+                remaining -= before + h + after
+                if overlap:
+                    prev_after = prev_after if getattr(flowable, '_SPACETRANSFER', False) else after
+                continue
+            parts = flowable.split(width, available)
+        else:
+            parts = []
+        if len(parts) > 1:
+            pending[0:0] = parts
+        elif at_top:
+            # Taller than a whole page and unsplittable: it takes the page
+            remaining = 0.0
+            at_top = False
+        else:
+            pages += 1
+            remaining, prev_after, at_top = height, 0.0, True
+            pending.insert(0, flowable)
+    return pages
+
+
+# Paragraph markup escaping, applied to every text value of a resume in one pass
+_MARKUP_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+
+
+def escape_markup(text: str) -> str:
+    """Escape user text for use inside ReportLab paragraph markup"""
+    return text.translate(_MARKUP_ESCAPES)
+
+
+# Heading/dates rows share one column layout and one immutable table style
+_ROW_COL_WIDTHS = ('70%', '30%')
+_ROW_TABLE_STYLE = TableStyle([
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 0),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+])
+
+
+# Section headings as (English, Chinese), shared by every output format
+SECTION_TITLES = {
+    'summary': ('Summary', '专业概述'),
+    'experience': ('Experience', '工作经历'),
+    'education': ('Education', '教育背景'),
+    'skills': ('Skills', '专业技能'),
+    'projects': ('Projects', '项目经验'),
+    'certifications': ('Certifications', '专业认证'),
+    'languages': ('Languages', '语言能力'),
+}
+
+
+# Section builders in document order
+SECTION_BUILDERS = (
+    '_add_header',
+    '_add_summary',
+    '_add_experience',
+    '_add_education',
+    '_add_skills',
+    '_add_projects',
+    '_add_certifications',
+    '_add_languages',
+)
+
+
+class _PDFSink:
+    """Write-only buffer that keeps ReportLab's output without copying it.
+
+    ReportLab hands the finished document to ``write()`` as a single bytes
+    object, so in the common case ``getvalue()`` returns that very object.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(data)
+        return len(data)
+
+    def getvalue(self) -> bytes:
+        if len(self._chunks) == 1:
+            return bytes(self._chunks[0])
+        return b''.join(self._chunks)
+
+
+class RenderStats:
+    """Wall and CPU time per render stage, plus document counts.
+
+    Stages are ``fonts``, ``fit`` in fit-to-pages mode, one per section
+    builder (``_add_header``, ...), ``layout`` for ReportLab's ``doc.build``,
+    and ``cache_lookup`` / ``cache_store`` when a render cache is used.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.flowables = 0
+        self.pages = 0
+        self.output_bytes = None
+        self.cached = False
+        self.fit_level = None          # set in fit-to-pages mode
+        self.profile = None            # pstats.Stats when profiling was requested
+        self.memory_peak_bytes = None  # set when memory tracing was requested
+        self.memory_top = None
+
+    @contextmanager
+    def stage(self, name: str):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.stages[name] = {
+                'wall_s': time.perf_counter() - wall,
+                'cpu_s': time.process_time() - cpu,
+            }
+
+    @property
+    def wall_s(self) -> float:
+        return sum(stage['wall_s'] for stage in self.stages.values())
+
+    def to_dict(self) -> dict:
+        return {
+            'stages': self.stages,
+            'wall_s': self.wall_s,
+            'flowables': self.flowables,
+            'pages': self.pages,
+            'output_bytes': self.output_bytes,
+            'cached': self.cached,
+            'fit_level': self.fit_level,
+            'memory_peak_bytes': self.memory_peak_bytes,
+            'memory_top': self.memory_top,
+        }
+
+
 class ResumeGenerator:
-    def __init__(self, data: dict, style: str = 'modern'):
+    def __init__(self, data: dict, style: str = 'modern', on_stats=None,
+                 profile: bool = False, trace_memory: bool = False, max_pages: int = None):
+        """Validate ``data`` up front (raises ResumeValidationError).
+
+        ``on_stats`` is called with a RenderStats after every render;
+        ``profile`` and ``trace_memory`` add cProfile and tracemalloc capture
+        to it, for digging into individual slow documents. With ``max_pages``
+        the layout is tightened step by step (see FIT_LEVELS), measuring
+        with ``wrap()`` only, until it fits; ``doc.build`` runs once."""
+        if max_pages is not None and max_pages < 1:
+            raise ValueError(f"max_pages must be at least 1, got {max_pages}")
         self.data = data
+        self.resume = parse_resume(data)
         self.style_name = style
+        self.layout = theme_layout(style)
         self.colors = STYLES.get(style, STYLES['modern'])
         self.elements = []
-        self._setup_styles()
-
-    def _setup_styles(self):
-        """Setup paragraph styles with Chinese font support"""
-        self.styles = getSampleStyleSheet()
-
-        # Name style
-        self.styles.add(ParagraphStyle(
-            'Name',
-            parent=self.styles['Heading1'],
-            fontName=CHINESE_FONT,
-            fontSize=24,
-            textColor=self.colors['primary'],
-            spaceAfter=2*mm,
-            alignment=TA_CENTER if self.style_name == 'modern' else TA_LEFT,
-        ))
-
-        # Title style
-        self.styles.add(ParagraphStyle(
-            'Title2',
-            parent=self.styles['Normal'],
-            fontName=CHINESE_FONT,
-            fontSize=12,
-            textColor=self.colors['light'],
-            spaceAfter=3*mm,
-            alignment=TA_CENTER if self.style_name == 'modern' else TA_LEFT,
-        ))
-
-        # Section header
-        self.styles.add(ParagraphStyle(
-            'SectionHeader',
-            parent=self.styles['Heading2'],
-            fontName=CHINESE_FONT,
-            fontSize=14,
-            textColor=self.colors['primary'],
-            spaceBefore=5*mm,
-            spaceAfter=3*mm,
-            borderPadding=(0, 0, 2, 0),
-        ))
-
-        # Company/Institution
-        self.styles.add(ParagraphStyle(
-            'Company',
-            parent=self.styles['Normal'],
-            fontName=CHINESE_FONT,
-            fontSize=11,
-            textColor=self.colors['text'],
-        ))
-
-        # Job title
-        self.styles.add(ParagraphStyle(
-            'JobTitle',
-            parent=self.styles['Normal'],
-            fontName=CHINESE_FONT,
-            fontSize=10,
-            textColor=self.colors['secondary'],
-        ))
-
-        # Date style
-        self.styles.add(ParagraphStyle(
-            'Date',
-            parent=self.styles['Normal'],
-            fontName=CHINESE_FONT,
-            fontSize=9,
-            textColor=self.colors['light'],
-            alignment=TA_RIGHT,
-        ))
-
-        # Bullet point
-        self.styles.add(ParagraphStyle(
-            'Bullet',
-            parent=self.styles['Normal'],
-            fontName=CHINESE_FONT,
-            fontSize=10,
-            textColor=self.colors['text'],
-            leftIndent=5*mm,
-            spaceBefore=1*mm,
-        ))
-
-        # Contact info
-        self.styles.add(ParagraphStyle(
-            'Contact',
-            parent=self.styles['Normal'],
-            fontName=CHINESE_FONT,
-            fontSize=9,
-            textColor=self.colors['light'],
-            alignment=TA_CENTER if self.style_name == 'modern' else TA_LEFT,
-        ))
-
-        # Summary
-        self.styles.add(ParagraphStyle(
-            'Summary',
-            parent=self.styles['Normal'],
-            fontName=CHINESE_FONT,
-            fontSize=10,
-            textColor=self.colors['text'],
-            spaceAfter=3*mm,
-            leading=14,
-        ))
+        self.on_stats = on_stats
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.max_pages = max_pages
+        self.fit_level = 0
+        self.stats = None
+
+    # Fonts and styles are resolved on first use so that a render-cache hit
+    # never has to register fonts or build ReportLab styles
+    @cached_property
+    def cjk_font(self):
+        """Font for CJK runs, or None when there are none (or no CJK font is installed)"""
+        font = font_for(self.data)
+        return None if font == DEFAULT_FONT else font
+
+    @cached_property
+    def styles(self):
+        # Styles use the Latin family and CJK runs switch font inline; touching
+        # cjk_font here registers the CJK font within the 'fonts' stage
+        self.cjk_font
+        return get_style_sheet(self.style_name, DEFAULT_FONT, self.fit_level)
+
+    @cached_property
+    def markup(self):
+        """The resume with every text value escaped for paragraph markup"""
+        return self.resume.map_text(escape_markup)
+
+    def _paragraph(self, text: str, style: str) -> Paragraph:
+        """Paragraph with each CJK run of ``text`` set in the CJK font"""
+        if self.cjk_font:
+            text = font_runs_markup(text, self.cjk_font)
+        return Paragraph(text, self.styles[style])
+
+    def cache_key(self, cache) -> str:
+        """Key identifying this render in a RenderCache"""
+        options = {'max_pages': self.max_pages} if self.max_pages else None
+        # The resolved palette and layout, not just the name: register_theme
+        # can redefine a theme between runs that share a persistent cache
+        theme = {
+            'name': self.style_name,
+            'layout': self.layout,
+            'palette': {key: value.hexval() for key, value in sorted(self.colors.items())},
+        }
+        return cache.key(self.data, theme, font_identity(self.data), GENERATOR_VERSION, options)
+
+    def _space(self, height: float) -> float:
+        """Vertical spacing scaled for the current fit level"""
+        return height * FIT_LEVELS[self.fit_level]['space']
+
+    def _highlights(self, highlights: tuple) -> tuple:
+        return highlights[:FIT_LEVELS[self.fit_level]['highlights']]
+
+    def _set_fit_level(self, level: int):
+        self.fit_level = level
+        self.__dict__.pop('styles', None)
+
+    def _build_elements(self, stats=None):
+        self.elements = []
+        for section in SECTION_BUILDERS:
+            if stats is None:
+                getattr(self, section)()
+            else:
+                with stats.stage(section):
+                    getattr(self, section)()
+
+    def _fits(self, level: int, max_pages: int, width: float, height: float) -> bool:
+        self._set_fit_level(level)
+        self._build_elements()
+        return count_pages(self.elements, width, height) <= max_pages
+
+    def _fit(self, max_pages: int) -> int:
+        """Pick the loosest fit level whose layout fits in ``max_pages``.
+
+        Levels only ever get tighter, so after the untouched layout the rest
+        are binary-searched; the tightest level is used if nothing fits.
+        """
+        doc = self._make_doc(_PDFSink())
+        width = doc.width - 2 * _FRAME_PADDING
+        height = doc.height - 2 * _FRAME_PADDING
+        if self._fits(0, max_pages, width, height):
+            return 0
+        low, high = 1, len(FIT_LEVELS) - 1
+        while low < high:
+            mid = (low + high) // 2
+            if self._fits(mid, max_pages, width, height):
+                high = mid
+            else:
+                low = mid + 1
+        self._set_fit_level(low)
+        return low
 
     def _add_header(self):
         """Add name and contact info"""
-        header = self.data.get('header', {})
+        header = self.markup.header
 
         # Name
-        if header.get('name'):
-            self.elements.append(Paragraph(header['name'], self.styles['Name']))
+        if header.name:
+            self.elements.append(self._paragraph(header.name, 'Name'))
 
         # Title
-        if header.get('title'):
-            self.elements.append(Paragraph(header['title'], self.styles['Title2']))
+        if header.title:
+            self.elements.append(self._paragraph(header.title, 'Title2'))
 
         # Contact info line
-        contact_parts = []
-        if header.get('email'):
-            contact_parts.append(header['email'])
-        if header.get('phone'):
-            contact_parts.append(header['phone'])
-        if header.get('location'):
-            contact_parts.append(header['location'])
+        contact_parts = [part for part in (header.email, header.phone, header.location) if part]
 
         if contact_parts:
-            self.elements.append(Paragraph(' | '.join(contact_parts), self.styles['Contact']))
+            self.elements.append(self._paragraph(' | '.join(contact_parts), 'Contact'))
 
         # Links line
-        link_parts = []
-        if header.get('linkedin'):
-            link_parts.append(header['linkedin'])
-        if header.get('github'):
-            link_parts.append(header['github'])
+        link_parts = [part for part in (header.linkedin, header.github) if part]
 
         if link_parts:
-            self.elements.append(Paragraph(' | '.join(link_parts), self.styles['Contact']))
+            self.elements.append(self._paragraph(' | '.join(link_parts), 'Contact'))
 
-        self.elements.append(Spacer(1, 5*mm))
+        self.elements.append(Spacer(1, self._space(5*mm)))
 
         # Divider line
-        if self.style_name != 'minimal':
+        if self.layout != 'minimal':
             self.elements.append(HRFlowable(
                 width="100%",
                 thickness=1,
                 color=self.colors['accent'],
-                spaceAfter=3*mm
+                spaceAfter=self._space(3*mm)
             ))
 
+    def _add_dated_row(self, heading: str, dates: str):
+        """Add a heading with right-aligned dates on the same line"""
+        t = Table(
+            [[self._paragraph(heading, 'Company'), self._paragraph(dates, 'Date')]],
+            colWidths=_ROW_COL_WIDTHS,
+        )
+        t.setStyle(_ROW_TABLE_STYLE)
+        self.elements.append(t)
+
     def _add_section_header(self, title: str):
         """Add section header with optional underline"""
-        self.elements.append(Paragraph(title, self.styles['SectionHeader']))
-        if self.style_name == 'classic':
+        self.elements.append(self._paragraph(title, 'SectionHeader'))
+        if self.layout == 'classic':
             self.elements.append(HRFlowable(
                 width="100%",
                 thickness=0.5,
                 color=self.colors['light'],
-                spaceAfter=2*mm
+                spaceAfter=self._space(2*mm)
             ))
 
     def _add_summary(self):
         """Add professional summary"""
-        if self.data.get('summary'):
-            self._add_section_header('专业概述' if self._is_chinese() else 'Summary')
-            self.elements.append(Paragraph(self.data['summary'], self.styles['Summary']))
+        if self.markup.summary:
+            self._add_section_header(self.section_title('summary'))
+            self.elements.append(self._paragraph(self.markup.summary, 'Summary'))
 
     def _add_experience(self):
         """Add work experience section"""
-        experience = self.data.get('experience', [])
+        experience = self.markup.experience
         if not experience:
             return
 
-        self._add_section_header('工作经历' if self._is_chinese() else 'Experience')
+        self._add_section_header(self.section_title('experience'))
 
         for job in experience:
             # Company and dates on same line
-            company_text = f"<b>{job.get('company', '')}</b>"
-            if job.get('location'):
-                company_text += f" - {job['location']}"
-
-            date_text = f"{job.get('start_date', '')} - {job.get('end_date', '')}"
-
-            # Use table for company/date alignment
-            data = [[
-                Paragraph(company_text, self.styles['Company']),
-                Paragraph(date_text, self.styles['Date'])
-            ]]
-            t = Table(data, colWidths=['70%', '30%'])
-            t.setStyle(TableStyle([
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('LEFTPADDING', (0, 0), (-1, -1), 0),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-            ]))
-            self.elements.append(t)
+            company_text = f"<b>{job.company}</b>"
+            if job.location:
+                company_text += f" - {job.location}"
+
+            self._add_dated_row(company_text, f"{job.start_date} - {job.end_date}")
 
             # Job title
-            if job.get('title'):
-                self.elements.append(Paragraph(job['title'], self.styles['JobTitle']))
+            if job.title:
+                self.elements.append(self._paragraph(job.title, 'JobTitle'))
 
             # Highlights
-            for highlight in job.get('highlights', []):
-                self.elements.append(Paragraph(f"• {highlight}", self.styles['Bullet']))
+            for highlight in self._highlights(job.highlights):
+                self.elements.append(self._paragraph(f"• {highlight}", 'Bullet'))
 
-            self.elements.append(Spacer(1, 3*mm))
+            self.elements.append(Spacer(1, self._space(3*mm)))
 
     def _add_education(self):
         """Add education section"""
-        education = self.data.get('education', [])
+        education = self.markup.education
         if not education:
             return
 
-        self._add_section_header('教育背景' if self._is_chinese() else 'Education')
+        self._add_section_header(self.section_title('education'))
 
         for edu in education:
             # Institution and dates
-            data = [[
-                Paragraph(f"<b>{edu.get('institution', '')}</b>", self.styles['Company']),
-                Paragraph(f"{edu.get('start_date', '')} - {edu.get('end_date', '')}", self.styles['Date'])
-            ]]
-            t = Table(data, colWidths=['70%', '30%'])
-            t.setStyle(TableStyle([
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('LEFTPADDING', (0, 0), (-1, -1), 0),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-            ]))
-            self.elements.append(t)
+            self._add_dated_row(f"<b>{edu.institution}</b>", f"{edu.start_date} - {edu.end_date}")
 
             # Degree
-            degree_text = edu.get('degree', '')
-            if edu.get('gpa'):
-                degree_text += f" | GPA: {edu['gpa']}"
-            self.elements.append(Paragraph(degree_text, self.styles['JobTitle']))
+            degree_text = edu.degree
+            if edu.gpa:
+                degree_text += f" | GPA: {edu.gpa}"
+            self.elements.append(self._paragraph(degree_text, 'JobTitle'))
 
-            self.elements.append(Spacer(1, 2*mm))
+            self.elements.append(Spacer(1, self._space(2*mm)))
 
     def _add_skills(self):
         """Add skills section"""
-        skills = self.data.get('skills', {})
+        skills = self.markup.skills
         if not skills:
             return
 
-        self._add_section_header('专业技能' if self._is_chinese() else 'Skills')
+        self._add_section_header(self.section_title('skills'))
 
-        if isinstance(skills, dict):
-            for category, skill_list in skills.items():
+        if self.markup.grouped_skills:
+            for category, skill_list in skills:
                 skill_text = f"<b>{category}:</b> {', '.join(skill_list)}"
-                self.elements.append(Paragraph(skill_text, self.styles['Bullet']))
-        elif isinstance(skills, list):
-            self.elements.append(Paragraph(', '.join(skills), self.styles['Summary']))
+                self.elements.append(self._paragraph(skill_text, 'Bullet'))
+        else:
+            self.elements.append(self._paragraph(', '.join(skills), 'Summary'))
 
-        self.elements.append(Spacer(1, 2*mm))
+        self.elements.append(Spacer(1, self._space(2*mm)))
 
     def _add_projects(self):
         """Add projects section"""
-        projects = self.data.get('projects', [])
+        projects = self.markup.projects
         if not projects:
             return
 
-        self._add_section_header('项目经验' if self._is_chinese() else 'Projects')
+        self._add_section_header(self.section_title('projects'))
 
         for project in projects:
-            self.elements.append(Paragraph(f"<b>{project.get('name', '')}</b>", self.styles['Company']))
-            if project.get('description'):
-                self.elements.append(Paragraph(project['description'], self.styles['JobTitle']))
-            for highlight in project.get('highlights', []):
-                self.elements.append(Paragraph(f"• {highlight}", self.styles['Bullet']))
-            self.elements.append(Spacer(1, 2*mm))
+            self.elements.append(self._paragraph(f"<b>{project.name}</b>", 'Company'))
+            if project.description:
+                self.elements.append(self._paragraph(project.description, 'JobTitle'))
+            for highlight in self._highlights(project.highlights):
+                self.elements.append(self._paragraph(f"• {highlight}", 'Bullet'))
+            self.elements.append(Spacer(1, self._space(2*mm)))
 
     def _add_certifications(self):
         """Add certifications section"""
-        certs = self.data.get('certifications', [])
+        certs = self.markup.certifications
         if not certs:
             return
 
-        self._add_section_header('专业认证' if self._is_chinese() else 'Certifications')
+        self._add_section_header(self.section_title('certifications'))
 
         for cert in certs:
-            cert_text = f"• <b>{cert.get('name', '')}</b>"
-            if cert.get('date'):
-                cert_text += f" ({cert['date']})"
-            self.elements.append(Paragraph(cert_text, self.styles['Bullet']))
+            cert_text = f"• <b>{cert.name}</b>"
+            if cert.date:
+                cert_text += f" ({cert.date})"
+            self.elements.append(self._paragraph(cert_text, 'Bullet'))
 
     def _add_languages(self):
         """Add languages section"""
-        languages = self.data.get('languages', [])
+        languages = self.markup.languages
         if not languages:
             return
 
-        self._add_section_header('语言能力' if self._is_chinese() else 'Languages')
+        self._add_section_header(self.section_title('languages'))
 
-        lang_parts = [f"{l.get('language', '')}: {l.get('proficiency', '')}" for l in languages]
-        self.elements.append(Paragraph(' | '.join(lang_parts), self.styles['Summary']))
+        lang_parts = [f"{l.language}: {l.proficiency}" for l in languages]
+        self.elements.append(self._paragraph(' | '.join(lang_parts), 'Summary'))
 
     def _is_chinese(self) -> bool:
         """Check if resume content is primarily Chinese"""
-        header = self.data.get('header', {})
-        name = header.get('name', '')
-        return any('\u4e00' <= c <= '\u9fff' for c in name)
-
-    def generate(self, output_path: str):
-        """Generate the PDF resume"""
-        doc = SimpleDocTemplate(
-            output_path,
+        return has_chinese(self.resume.header.name)
+
+    def section_title(self, key: str) -> str:
+        """Heading for a section, in the resume's language"""
+        return SECTION_TITLES[key][1 if self._is_chinese() else 0]
+
+    @cached_property
+    def hex_colors(self) -> dict:
+        """The theme palette as ``#rrggbb`` strings, for non-PDF renderers"""
+        return {key: '#' + color.hexval()[2:] for key, color in self.colors.items()}
+
+    def _make_doc(self, output):
+        """Create the page template for ``output`` (a path or binary buffer)"""
+        return SimpleDocTemplate(
+            os.fspath(output) if isinstance(output, os.PathLike) else output,
             pagesize=A4,
             rightMargin=2*cm,
             leftMargin=2*cm,
@@ -385,37 +696,395 @@ class ResumeGenerator:
             bottomMargin=1.5*cm
         )
 
-        # Build content
-        self._add_header()
-        self._add_summary()
-        self._add_experience()
-        self._add_education()
-        self._add_skills()
-        self._add_projects()
-        self._add_certifications()
-        self._add_languages()
+    def _render(self, output):
+        """Build every section and lay out the document, timing each stage"""
+        stats = self.stats
+        with stats.stage('fonts'):
+            self.styles
+
+        if self.max_pages:
+            with stats.stage('fit'):
+                stats.fit_level = self._fit(self.max_pages)
+
+        self._build_elements(stats)
+        stats.flowables = len(self.elements)
+
+        doc = self._make_doc(output)
+        with stats.stage('layout'):
+            doc.build(self.elements)
+        stats.pages = doc.page
+
+    @contextmanager
+    def _instrument(self):
+        """Collect a fresh RenderStats, with optional profiling, for one render"""
+        stats = self.stats = RenderStats()
+        profiler = cProfile.Profile() if self.profile else None
+        # Leave tracing that was already running (-X tracemalloc, an outer
+        # harness) alone; only stop what this render started
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.trace_memory:
+            # Measure this render's peak, not the outer session's
+            tracemalloc.reset_peak()
+        if profiler:
+            profiler.enable()
+        try:
+            yield stats
+        finally:
+            if profiler:
+                profiler.disable()
+                stats.profile = pstats.Stats(profiler)
+            if self.trace_memory:
+                snapshot = tracemalloc.take_snapshot()
+                stats.memory_peak_bytes = tracemalloc.get_traced_memory()[1]
+                if started_tracing:
+                    tracemalloc.stop()
+                stats.memory_top = [str(s) for s in snapshot.statistics('lineno')[:10]]
+        if self.on_stats:
+            self.on_stats(stats)
+
+    def generate(self, output, cache=None):
+        """Generate the PDF resume.
+
+        ``output`` is either a filesystem path or a writable binary file-like
+        object (an open file, ``io.BytesIO``, an HTTP response body...).
+        With a ``RenderCache``, unchanged resumes are served from the cache
+        without invoking ReportLab. Returns ``output`` unchanged; timings of
+        the render are left in ``self.stats``.
+        """
+        if cache is not None:
+            pdf = self.render_bytes(cache)
+            if hasattr(output, 'write'):
+                output.write(pdf)
+            else:
+                Path(output).write_bytes(pdf)
+            return output
+
+        with self._instrument():
+            self._render(output)
+        return output
+
+    def render_bytes(self, cache=None) -> bytes:
+        """Render the PDF in memory and return its bytes, without a temp file"""
+        with self._instrument() as stats:
+            if cache is not None:
+                with stats.stage('cache_lookup'):
+                    key = self.cache_key(cache)
+                    pdf = cache.get(key)
+                if pdf is not None:
+                    stats.cached = True
+                    stats.output_bytes = len(pdf)
+                    return pdf
+
+            sink = _PDFSink()
+            self._render(sink)
+            pdf = sink.getvalue()
+            stats.output_bytes = len(pdf)
+
+            if cache is not None:
+                with stats.stage('cache_store'):
+                    cache.put(key, pdf)
+            return pdf
+
+    def render(self, fmt: str = 'pdf', cache=None) -> bytes:
+        """Render the resume in any registered output format (see RENDERERS).
+
+        Every format reads the same parsed resume and theme; only PDF goes
+        through the render cache and fit-to-pages mode, the others are cheap
+        enough to render straight from the model.
+        """
+        if fmt == 'pdf':
+            return self.render_bytes(cache)
+        if fmt not in RENDERERS:
+            raise ValueError(f"Unknown output format '{fmt}' (choose from {', '.join(RENDERERS)})")
+        with self._instrument() as stats:
+            with stats.stage(fmt):
+                output = RENDERERS[fmt][1](self)
+            stats.output_bytes = len(output)
+            return output
+
+    def write_outputs(self, output, formats=('pdf',), cache=None) -> list:
+        """Write one file per format next to ``output``, returning their paths.
+
+        Each path is ``output`` with the format's extension, so one call
+        emits e.g. ``cv.pdf``, ``cv.docx`` and ``cv.html`` from one parse.
+        """
+        paths = []
+        for fmt in formats:
+            content = self.render(fmt, cache)
+            path = Path(output).with_suffix(RENDERERS[fmt][0])
+            path.write_bytes(content)
+            paths.append(path)
+        return paths
+
+
+# Output format -> (file extension, renderer taking a ResumeGenerator and returning bytes)
+RENDERERS = {}
+
+
+def register_renderer(fmt: str, extension: str, render):
+    """Register an output format; renderers read ``generator.resume`` and its theme helpers"""
+    RENDERERS[fmt] = (extension, render)
+
+
+register_renderer('pdf', '.pdf', ResumeGenerator.render_bytes)
+register_renderer('html', '.html', render_html)
+register_renderer('docx', '.docx', render_docx)
+
+
+def parse_formats(value: str) -> tuple:
+    """Parse a comma-separated ``--format`` value"""
+    formats = tuple(dict.fromkeys(f.strip().lower() for f in value.split(',') if f.strip()))
+    unknown = [f for f in formats if f not in RENDERERS]
+    if unknown or not formats:
+        raise argparse.ArgumentTypeError(
+            f"unknown format(s): {', '.join(unknown) or repr(value)} (choose from {', '.join(RENDERERS)})")
+    return formats
+
+
+def positive_int(value: str) -> int:
+    """Parse a ``--max-pages`` value, which must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def _iter_batch_jobs(source: str, output_dir: Path):
+    """Yield (name, record, output_path) for every record in a batch source.
+
+    The source may be a directory of ``*.json`` files, a JSONL file, or ``-``
+    for JSONL on stdin. A record is a file path or a raw JSONL line (bytes);
+    reading, decoding and parsing happen in the workers so that unreadable
+    or malformed records are reported like any other per-record failure.
+    """
+    if source != '-' and Path(source).is_dir():
+        for path in sorted(Path(source).glob('*.json')):
+            yield path.stem, path, str(output_dir / f"{path.stem}.pdf")
+        return
+
+    stream = sys.stdin.buffer if source == '-' else open(source, 'rb')
+    try:
+        for lineno, line in enumerate(stream, 1):
+            if line.strip():
+                name = f"{lineno:06d}"
+                yield name, line, str(output_dir / f"{name}.pdf")
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+
+
+# Per-worker render cache, set up by _init_batch_worker
+_batch_cache = None
+_batch_max_pages = None
+_batch_formats = ('pdf',)
+# Per-run directory where workers claim output names, so two records that
+# resolve to the same file cannot silently overwrite each other
+_batch_claims_dir = None
+
+
+def _warm_fonts_and_styles():
+    """Parse the fonts and build every style sheet in this process"""
+    get_cjk_font()
+    for style in STYLES:
+        get_style_sheet(style, DEFAULT_FONT)
+
+
+def _init_batch_worker(cache_dir: str = None, cache_bytes: int = DEFAULT_MAX_BYTES,
+                       max_pages: int = None, formats: tuple = ('pdf',), claims_dir: str = None):
+    """Warm up a batch worker once so every job it renders skips the setup cost"""
+    global _batch_cache, _batch_max_pages, _batch_formats, _batch_claims_dir
+    _batch_max_pages = max_pages
+    _batch_formats = formats
+    _batch_claims_dir = claims_dir
+    if cache_dir:
+        _batch_cache = RenderCache(cache_dir, cache_bytes)
+    # A no-op for forked workers, which inherit the parent's warm state
+    _warm_fonts_and_styles()
+
+
+def _claim_output(output_path: str):
+    """Reserve an output name for this batch run, failing if a record already has it"""
+    if _batch_claims_dir is None:
+        return
+    stem = Path(output_path).stem
+    try:
+        os.close(os.open(os.path.join(_batch_claims_dir, stem), os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        raise ValueError(f"duplicate output name '{stem}': another record in this batch "
+                         "is written there") from None
 
-        # Generate PDF
-        doc.build(self.elements)
-        return output_path
+
+def _render_batch_job(job):
+    """Render one batch record, returning (name, output_path, error, seconds, cache_hit)"""
+    name, record, output_path = job
+    start = time.perf_counter()
+    hits = _batch_cache.hits if _batch_cache else 0
+    try:
+        raw = record.read_bytes() if isinstance(record, Path) else record
+        data = json.loads(raw.decode('utf-8'))
+        if not isinstance(data, dict):
+            raise ValueError("resume record must be a JSON object")
+        # JSONL records may name their own output file
+        if data.get('id'):
+            output_path = str(Path(output_path).with_name(f"{data['id']}.pdf"))
+        _claim_output(output_path)
+        generator = ResumeGenerator(data, data.get('style', 'modern'), max_pages=_batch_max_pages)
+        # Every format is rendered from this one parse, with no extra round-trips
+        generator.write_outputs(output_path, _batch_formats, _batch_cache)
+        error = None
+    except Exception as e:
+        error = str(e) or e.__class__.__name__
+    cache_hit = bool(_batch_cache) and _batch_cache.hits > hits
+    return name, output_path, error, time.perf_counter() - start, cache_hit
+
+
+def _render_batch_chunk(jobs: list) -> list:
+    """Render a chunk of batch records in one worker round-trip"""
+    return [_render_batch_job(job) for job in jobs]
+
+
+# Records sent to a worker per task, and tasks kept in flight per worker;
+# together they bound how much of a batch source is read ahead of the workers
+BATCH_CHUNK_SIZE = 8
+BATCH_CHUNKS_PER_WORKER = 4
+
+
+def run_batch(source: str, output_dir: str, workers: int = None,
+              cache_dir: str = None, cache_bytes: int = DEFAULT_MAX_BYTES,
+              max_pages: int = None, formats: tuple = ('pdf',)) -> int:
+    """Render many resumes across a process pool, returning the failure count.
+
+    Each resume is written once per entry of ``formats`` (see RENDERERS).
+    """
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    ok = failed = cache_hits = 0
+    start = time.perf_counter()
+    # Forked workers share the parent's parsed font tables and style sheets
+    # copy-on-write, so a large CJK TTC is parsed once per batch, not per worker
+    if multiprocessing.get_start_method() == 'fork':
+        _warm_fonts_and_styles()
+    with tempfile.TemporaryDirectory(prefix='resume-batch-') as claims_dir, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                initargs=(cache_dir, cache_bytes, max_pages, formats, claims_dir)) as pool:
+        # Submit in a bounded window instead of pool.map, which would read the
+        # whole source and queue every record before yielding a result
+        jobs = _iter_batch_jobs(source, out)
+        window = workers * BATCH_CHUNKS_PER_WORKER
+        pending = set()
+        while True:
+            while len(pending) < window:
+                chunk = list(islice(jobs, BATCH_CHUNK_SIZE))
+                if not chunk:
+                    break
+                pending.add(pool.submit(_render_batch_chunk, chunk))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for name, output_path, error, _, cache_hit in future.result():
+                    cache_hits += cache_hit
+                    if error is None:
+                        ok += 1
+                    else:
+                        failed += 1
+                        print(f"Error [{name}]: {error}", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+
+    total = ok + failed
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"Batch complete: {ok}/{total} resumes generated ({', '.join(formats)}), {failed} failed "
+          f"in {elapsed:.2f}s ({rate:.1f} resumes/s, {workers} workers)")
+    if cache_dir:
+        print(f"Render cache: {cache_hits}/{total} resumes served from cache")
+    return failed
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Generate resume PDFs (and DOCX/HTML) from JSON data",
+        usage="python generate_resume.py <data.json> <output.pdf>\n"
+              "       python generate_resume.py --batch <dir|file.jsonl|-> <output_dir>",
+    )
+    parser.add_argument('input', nargs='?', help="resume JSON file (batch: directory, JSONL file or '-')")
+    parser.add_argument('output', nargs='?', help="output PDF path (batch: output directory)")
+    parser.add_argument('--batch', action='store_true', help="render many resumes in a process pool")
+    parser.add_argument('--workers', type=int, default=None, help="batch worker processes (default: CPU count)")
+    parser.add_argument('--cache-dir', default=None, help="reuse PDFs of unchanged resumes from this directory")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="render cache size limit in MB (default: %(default)s)")
+    parser.add_argument('--format', type=parse_formats, default=('pdf',), metavar='FMT[,FMT...]',
+                        help=f"output formats, comma-separated: {', '.join(RENDERERS)} (default: pdf); "
+                             "each is written with its own extension")
+    parser.add_argument('--max-pages', type=positive_int, default=None, metavar='N',
+                        help="tighten spacing, font size and highlights until the resume fits N pages")
+    parser.add_argument('--stats', action='store_true', help="print per-stage render timings as JSON to stderr")
+    parser.add_argument('--profile', default=None, metavar='FILE', help="write cProfile data for the render to FILE")
+    parser.add_argument('--trace-memory', action='store_true', help="include tracemalloc peak and top allocations in --stats")
+    return parser
 
 
 def main():
-    if len(sys.argv) < 3:
+    args = _build_parser().parse_args()
+    if not args.input or not args.output:
         print("Error: Usage: python generate_resume.py <data.json> <output.pdf>")
         sys.exit(1)
 
-    data_path = sys.argv[1]
-    output_path = sys.argv[2]
+    if args.batch:
+        try:
+            failed = run_batch(args.input, args.output, args.workers,
+                               args.cache_dir, args.cache_size * 1024 * 1024, args.max_pages, args.format)
+        except Exception as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        sys.exit(1 if failed else 0)
+
+    data_path = args.input
+    output_path = args.output
 
     try:
         with open(data_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
 
-        style = data.get('style', 'modern')
-        generator = ResumeGenerator(data, style)
-        generator.generate(output_path)
-        print(f"Resume generated: {output_path}")
+        style = data.get('style', 'modern') if isinstance(data, dict) else 'modern'
+        rendered = []
+        generator = ResumeGenerator(data, style, on_stats=rendered.append, profile=bool(args.profile),
+                                    trace_memory=args.trace_memory, max_pages=args.max_pages)
+        cache = RenderCache(args.cache_dir, args.cache_size * 1024 * 1024) if args.cache_dir else None
+        if args.format == ('pdf',):
+            # A lone PDF keeps the exact output path given, whatever its extension
+            generator.generate(output_path, cache)
+            paths = [output_path]
+        else:
+            paths = generator.write_outputs(output_path, args.format, cache)
+        for path in paths:
+            print(f"Resume generated: {path}")
+
+        stats = dict(zip(args.format, rendered))
+        pdf_stats = stats.get('pdf')
+        if args.max_pages and pdf_stats and pdf_stats.pages > args.max_pages:
+            print(f"Warning: even the tightest layout needs {pdf_stats.pages} pages "
+                  f"(limit {args.max_pages}); trim the content to fit", file=sys.stderr)
+        if args.stats:
+            if len(stats) == 1:
+                report = rendered[0].to_dict()
+            else:
+                report = {fmt: s.to_dict() for fmt, s in stats.items()}
+            print(json.dumps(report, indent=2), file=sys.stderr)
+        if args.profile and pdf_stats and pdf_stats.profile:
+            pdf_stats.profile.dump_stats(args.profile)
+    except ResumeValidationError as e:
+        print("Error: Invalid resume data:")
+        for path, message in e.errors:
+            print(f"  - {path}: {message}")
+        sys.exit(1)
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
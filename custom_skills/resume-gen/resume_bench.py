@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the resume rendering pipeline.
+
+Generates synthetic resumes of several sizes, in Latin and CJK text, for
+every theme, and measures for each case:
+
+- per-section flowable build time (``_add_header``, ``_add_experience``, ...)
+- ``doc.build`` layout time
+- peak Python memory during a separate, untimed render (tracemalloc)
+- output PDF size, and the bytes of embedded font programs against the
+  size of the font file they were subset from
+
+plus the cold-start time of a fresh interpreter importing the generator and
+rendering one resume. Results are printed (or written) as JSON so runs can
+be diffed across commits:
+
+    python resume_bench.py --repeat 5 --output bench.json
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+from pathlib import Path
+
+import generate_resume
+from generate_resume import SECTION_BUILDERS, STYLES, ResumeGenerator
+from resume_fonts import get_cjk_font, resolve_cjk_font_path
+
+HERE = Path(__file__).resolve().parent
+
+SIZES = {
+    'small': {'jobs': 1, 'highlights': 2, 'projects': 1},
+    'medium': {'jobs': 4, 'highlights': 4, 'projects': 3},
+    'large': {'jobs': 12, 'highlights': 8, 'projects': 8},
+}
+
+TEXT = {
+    'latin': {
+        'name': 'Jane Doe',
+        'title': 'Senior Software Engineer',
+        'company': 'Example Corp',
+        'role': 'Backend Engineer',
+        'highlight': 'Reduced p99 latency of the payments API by 40% through query batching',
+        'summary': 'Engineer with ten years of experience building distributed systems.',
+        'school': 'State University',
+        'degree': 'B.S. Computer Science',
+        'project': 'Recommendation Engine',
+        'language': 'English',
+    },
+    'cjk': {
+        'name': '张三',
+        'title': '高级软件工程师',
+        'company': '某科技公司',
+        'role': '后端工程师',
+        'highlight': '主导开发了公司核心交易系统，日处理交易量超过100万笔',
+        'summary': '拥有十年软件开发经验的全栈工程师，专注于分布式系统。',
+        'school': '北京大学',
+        'degree': '计算机科学与技术 学士',
+        'project': '智能推荐系统',
+        'language': '中文',
+    },
+}
+
+
+def synthetic_resume(size: str, script: str, style: str) -> dict:
+    """Build a resume with the given number of entries and text script"""
+    shape = SIZES[size]
+    t = TEXT[script]
+    return {
+        'style': style,
+        'header': {
+            'name': t['name'],
+            'title': t['title'],
+            'email': 'someone@example.com',
+            'phone': '+1 555-0100',
+            'location': 'Somewhere',
+            'linkedin': 'linkedin.com/in/someone',
+            'github': 'github.com/someone',
+        },
+        'summary': t['summary'] * 2,
+        'experience': [
+            {
+                'company': f"{t['company']} {i}",
+                'title': t['role'],
+                'location': 'Remote',
+                'start_date': f"{2010 + i}-01",
+                'end_date': f"{2011 + i}-06",
+                'highlights': [f"{t['highlight']} ({j})" for j in range(shape['highlights'])],
+            }
+            for i in range(shape['jobs'])
+        ],
+        'education': [
+            {'institution': t['school'], 'degree': t['degree'],
+             'start_date': '2006-09', 'end_date': '2010-06', 'gpa': '3.8/4.0'},
+        ],
+        'skills': {
+            'Languages': ['Python', 'Go', 'Rust', 'TypeScript'],
+            'Data': ['PostgreSQL', 'Redis', 'Kafka'],
+        },
+        'projects': [
+            {'name': f"{t['project']} {i}", 'description': t['summary'],
+             'highlights': [t['highlight']] * 2}
+            for i in range(shape['projects'])
+        ],
+        'certifications': [{'name': 'AWS Solutions Architect', 'date': '2023-05'}],
+        'languages': [{'language': t['language'], 'proficiency': 'Native'}],
+    }
+
+
+_FONT_FILE_REF = re.compile(rb'/FontFile[23]? (\d+) 0 R')
+
+
+def embedded_font_bytes(pdf: bytes) -> int:
+    """Total (compressed) size of the font programs embedded in a PDF"""
+    total = 0
+    for obj in set(_FONT_FILE_REF.findall(pdf)):
+        match = re.search(rb'\n' + obj + rb' 0 obj\s*<<(.*?)>>\s*stream', pdf, re.S)
+        length = match and re.search(rb'/Length (\d+)', match.group(1))
+        if length:
+            total += int(length.group(1))
+    return total
+
+
+def cjk_font_file() -> dict:
+    """The CJK font file subsets are taken from, or None when there is none"""
+    path = resolve_cjk_font_path()
+    if path is None or get_cjk_font() == generate_resume.DEFAULT_FONT:
+        return None
+    return {'path': path, 'file_bytes': os.path.getsize(path)}
+
+
+def measure_render(data: dict, style: str) -> dict:
+    """Time one render stage by stage, recording output size.
+
+    tracemalloc is left off so its overhead stays out of the timings; peak
+    memory comes from ``measure_peak_memory`` instead.
+    """
+    generator = ResumeGenerator(data, style)
+    pdf = generator.render_bytes()
+    stats = generator.stats
+
+    return {
+        'setup_s': stats.stages['fonts']['wall_s'],
+        'sections_s': {name: stats.stages[name]['wall_s'] for name in SECTION_BUILDERS},
+        'doc_build_s': stats.stages['layout']['wall_s'],
+        'total_s': stats.wall_s,
+        'output_bytes': stats.output_bytes,
+        'font_bytes': embedded_font_bytes(pdf),
+        'flowables': stats.flowables,
+        'pages': stats.pages,
+    }
+
+
+def measure_peak_memory(data: dict, style: str) -> int:
+    """Peak Python memory of one render, traced with tracemalloc"""
+    generator = ResumeGenerator(data, style, trace_memory=True)
+    generator.render_bytes()
+    return generator.stats.memory_peak_bytes
+
+
+def _median_run(runs: list) -> dict:
+    """Collapse repeated runs into per-metric medians"""
+    def median(values):
+        values = sorted(values)
+        return values[len(values) // 2]
+
+    result = dict(runs[-1])
+    for key in ('setup_s', 'doc_build_s', 'total_s'):
+        result[key] = median([r[key] for r in runs])
+    result['sections_s'] = {
+        name: median([r['sections_s'][name] for r in runs])
+        for name in runs[0]['sections_s']
+    }
+    return result
+
+
+def measure_cold_start(repeat: int) -> dict:
+    """Time fresh interpreters: bare import, and import plus one full render"""
+    data = json.dumps(synthetic_resume('medium', 'cjk', 'modern'), ensure_ascii=False)
+    import_code = "import generate_resume"
+    render_code = (
+        "import sys, json, generate_resume; "
+        "generate_resume.ResumeGenerator(json.loads(sys.stdin.read())).render_bytes()"
+    )
+
+    def run(code, stdin=''):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], cwd=HERE, input=stdin,
+                       text=True, check=True)
+        return time.perf_counter() - start
+
+    imports = sorted(run(import_code) for _ in range(repeat))
+    renders = sorted(run(render_code, data) for _ in range(repeat))
+    return {
+        'import_s': imports[len(imports) // 2],
+        'import_and_render_s': renders[len(renders) // 2],
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(repeat: int = 3, styles=None, sizes=None, scripts=None,
+                   cold_start: bool = True) -> dict:
+    styles = styles or [s for s in ('modern', 'classic', 'minimal') if s in STYLES]
+    sizes = sizes or list(SIZES)
+    scripts = scripts or list(TEXT)
+
+    font_file = cjk_font_file()
+    cases = []
+    for size in sizes:
+        for script in scripts:
+            for style in styles:
+                data = synthetic_resume(size, script, style)
+                measure_render(data, style)  # warm-up: fonts, style sheets, glyph caches
+                runs = [measure_render(data, style) for _ in range(repeat)]
+                case = {'size': size, 'script': script, 'style': style, **_median_run(runs)}
+                case['peak_memory_bytes'] = measure_peak_memory(data, style)
+                # Share of the font file that subsetting kept out of the PDF
+                if font_file and case['font_bytes']:
+                    case['font_size_reduction'] = round(1 - case['font_bytes'] / font_file['file_bytes'], 4)
+                cases.append(case)
+
+    return {
+        'commit': _git_commit(),
+        'generator_version': generate_resume.GENERATOR_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'cjk_font': font_file,
+        'cold_start': measure_cold_start(repeat) if cold_start else None,
+        'cases': cases,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark resume rendering")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per case (median is reported)")
+    parser.add_argument('--style', action='append', help="theme to benchmark (repeatable)")
+    parser.add_argument('--size', action='append', choices=list(SIZES), help="resume size (repeatable)")
+    parser.add_argument('--script', action='append', choices=list(TEXT), help="text script (repeatable)")
+    parser.add_argument('--no-cold-start', action='store_true', help="skip the subprocess cold-start timing")
+    parser.add_argument('--output', default=None, help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.repeat, args.style, args.size, args.script,
+                             cold_start=not args.no_cold_start)
+    text = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(text + '\n', encoding='utf-8')
+        print(f"Benchmark results written: {args.output}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
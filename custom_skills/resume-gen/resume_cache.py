@@ -0,0 +1,122 @@
+"""
+Content-addressed on-disk cache for rendered resume PDFs.
+
+A rendered PDF depends only on the resume data, the theme, the font that
+would be used, the generator version and any output-changing render
+options, so those are hashed into the cache key. Entries live under
+``<cache_dir>/<key[:2]>/<key>.pdf``; the file mtime doubles as the LRU
+timestamp (it is bumped on every hit) and the oldest entries are evicted
+once the store grows past ``max_bytes``. Several processes may share one
+directory: writes are atomic renames and eviction tolerates files that
+disappear underneath it.
+"""
+import os
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class RenderCache:
+    def __init__(self, directory, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = None  # lazily computed total bytes on disk
+
+    @staticmethod
+    def key(data: dict, style, font: str, version: str, options: dict = None) -> str:
+        """Hash the canonicalized resume data together with its render inputs.
+
+        ``style`` identifies the theme (a name, or its resolved palette and
+        layout). ``options`` holds render options that change the output
+        (e.g. a page budget); without options the key is the same as before
+        they existed.
+        """
+        inputs = [data, style, font, version]
+        if options:
+            inputs.append(options)
+        canonical = json.dumps(
+            inputs,
+            sort_keys=True, ensure_ascii=False, separators=(',', ':'),
+        )
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.pdf"
+
+    def get(self, key: str):
+        """Return the cached PDF bytes for ``key``, or None on a miss"""
+        path = self._path(key)
+        try:
+            pdf = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return pdf
+
+    def put(self, key: str, pdf: bytes):
+        """Store a rendered PDF and evict old entries if over budget"""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(pdf)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+        if self._size is None:
+            self._size = self._scan_size()
+        else:
+            self._size += len(pdf)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _entries(self):
+        """Return (mtime, size, path) for every entry still on disk"""
+        entries = []
+        for path in self.directory.glob('*/*.pdf'):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """Drop least recently used entries until the store fits in 90% of budget"""
+        entries = sorted(self._entries())
+        size = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            try:
+                path.unlink()
+                self.evictions += 1
+            except OSError:
+                pass
+            size -= entry_size
+        self._size = size
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
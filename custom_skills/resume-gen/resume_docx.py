@@ -0,0 +1,180 @@
+"""
+Word (.docx) output for the resume generator.
+
+Built with python-docx from the same normalized resume, theme palette and
+layout as the PDF. python-docx is optional: it is imported on first use,
+so PDF and HTML rendering work without it.
+
+Word picks the East Asian font per character itself, so CJK text only
+needs the ``eastAsia`` font set on the document's base style.
+"""
+import io
+
+# Font Word uses for CJK characters; Office substitutes a local CJK font if missing
+DOCX_CJK_FONT = 'Microsoft YaHei'
+
+
+def _import_docx():
+    try:
+        import docx
+    except ImportError:
+        raise RuntimeError("DOCX output requires python-docx (pip install python-docx)") from None
+    return docx
+
+
+class _DocxWriter:
+    """Adds resume sections to a python-docx Document"""
+
+    def __init__(self, docx, generator):
+        from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_TAB_ALIGNMENT
+        from docx.oxml import OxmlElement
+        from docx.oxml.ns import qn
+        from docx.shared import Mm, Pt, RGBColor
+
+        self.Pt = Pt
+        self.OxmlElement = OxmlElement
+        self.qn = qn
+        self.generator = generator
+        self.layout = generator.layout
+        self.colors = {
+            key: RGBColor.from_string(value[1:].upper())
+            for key, value in generator.hex_colors.items()
+        }
+        self.hex_colors = {key: value[1:] for key, value in generator.hex_colors.items()}
+        self.align = WD_ALIGN_PARAGRAPH.CENTER if self.layout == 'modern' else WD_ALIGN_PARAGRAPH.LEFT
+        self.tab_alignment = WD_TAB_ALIGNMENT.RIGHT
+
+        self.document = docx.Document()
+        section = self.document.sections[0]
+        section.page_width, section.page_height = Mm(210), Mm(297)
+        section.left_margin = section.right_margin = Mm(20)
+        section.top_margin = section.bottom_margin = Mm(15)
+        self.text_width = section.page_width - section.left_margin - section.right_margin
+
+        normal = self.document.styles['Normal']
+        normal.font.name = 'Helvetica'
+        normal.font.size = Pt(10)
+        normal.font.color.rgb = self.colors['text']
+        normal.element.get_or_add_rPr().get_or_add_rFonts().set(qn('w:eastAsia'), DOCX_CJK_FONT)
+        normal.paragraph_format.space_after = Pt(0)
+
+    def paragraph(self, text: str = '', size: float = 10, color: str = 'text', bold: bool = False,
+                  style: str = None, space_before: float = 0, space_after: float = 0):
+        p = self.document.add_paragraph(style=style)
+        p.paragraph_format.space_before = self.Pt(space_before)
+        p.paragraph_format.space_after = self.Pt(space_after)
+        if text:
+            self.run(p, text, size, color, bold)
+        return p
+
+    def run(self, p, text: str, size: float = 10, color: str = 'text', bold: bool = False):
+        run = p.add_run(text)
+        run.font.size = self.Pt(size)
+        run.font.color.rgb = self.colors[color]
+        run.bold = bold
+        return run
+
+    def rule(self, p, size: int, color: str):
+        """Bottom border under paragraph ``p`` (``size`` in eighths of a point)"""
+        border = self.OxmlElement('w:bottom')
+        for key, value in (('val', 'single'), ('sz', str(size)), ('space', '1'),
+                           ('color', self.hex_colors[color])):
+            border.set(self.qn(f'w:{key}'), value)
+        borders = self.OxmlElement('w:pBdr')
+        borders.append(border)
+        p._p.get_or_add_pPr().append(borders)
+
+    def section_header(self, key: str):
+        p = self.paragraph(self.generator.section_title(key), size=14, color='primary',
+                           space_before=14, space_after=8)
+        if self.layout == 'classic':
+            self.rule(p, 4, 'light')
+
+    def dated_row(self, heading: str, dates: str, location: str = ''):
+        """Heading with dates pushed to the right margin by a right tab stop"""
+        p = self.paragraph()
+        p.paragraph_format.tab_stops.add_tab_stop(self.text_width, self.tab_alignment)
+        self.run(p, heading, size=11, bold=True)
+        if location:
+            self.run(p, f' - {location}', size=11)
+        self.run(p, f'\t{dates}', size=9, color='light')
+
+    def bullets(self, items):
+        for item in items:
+            self.paragraph(item, style='List Bullet', space_before=3)
+
+    def header(self, header):
+        if header.name:
+            self.paragraph(header.name, size=24, color='primary', space_after=6).alignment = self.align
+        if header.title:
+            self.paragraph(header.title, size=12, color='light', space_after=8).alignment = self.align
+        for line in ((header.email, header.phone, header.location), (header.linkedin, header.github)):
+            line = [part for part in line if part]
+            if line:
+                self.paragraph(' | '.join(line), size=9, color='light').alignment = self.align
+        divider = self.paragraph(space_after=8)
+        if self.layout != 'minimal':
+            self.rule(divider, 8, 'accent')
+
+    def write(self, resume):
+        self.header(resume.header)
+
+        if resume.summary:
+            self.section_header('summary')
+            self.paragraph(resume.summary, space_after=8)
+
+        if resume.experience:
+            self.section_header('experience')
+            for job in resume.experience:
+                self.dated_row(job.company, f'{job.start_date} - {job.end_date}', job.location)
+                if job.title:
+                    self.paragraph(job.title, color='secondary')
+                self.bullets(job.highlights)
+                self.paragraph(space_after=6)
+
+        if resume.education:
+            self.section_header('education')
+            for edu in resume.education:
+                self.dated_row(edu.institution, f'{edu.start_date} - {edu.end_date}')
+                degree = edu.degree + (f' | GPA: {edu.gpa}' if edu.gpa else '')
+                self.paragraph(degree, color='secondary', space_after=6)
+
+        if resume.skills:
+            self.section_header('skills')
+            if resume.grouped_skills:
+                for category, items in resume.skills:
+                    p = self.paragraph(style='List Bullet', space_before=3)
+                    self.run(p, f'{category}: ', bold=True)
+                    self.run(p, ', '.join(items))
+            else:
+                self.paragraph(', '.join(resume.skills))
+
+        if resume.projects:
+            self.section_header('projects')
+            for project in resume.projects:
+                self.paragraph(project.name, size=11, bold=True)
+                if project.description:
+                    self.paragraph(project.description, color='secondary')
+                self.bullets(project.highlights)
+                self.paragraph(space_after=6)
+
+        if resume.certifications:
+            self.section_header('certifications')
+            for cert in resume.certifications:
+                p = self.paragraph(style='List Bullet', space_before=3)
+                self.run(p, cert.name, bold=True)
+                if cert.date:
+                    self.run(p, f' ({cert.date})')
+
+        if resume.languages:
+            self.section_header('languages')
+            self.paragraph(' | '.join(f'{l.language}: {l.proficiency}' for l in resume.languages))
+
+
+def render_docx(generator) -> bytes:
+    """Render a ResumeGenerator's resume as a .docx document"""
+    writer = _DocxWriter(_import_docx(), generator)
+    writer.write(generator.resume)
+    buffer = io.BytesIO()
+    writer.document.save(buffer)
+    return buffer.getvalue()
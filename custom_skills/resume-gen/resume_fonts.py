@@ -0,0 +1,247 @@
+"""
+Lazy CJK font discovery and registration for the resume generator.
+
+Nothing is probed or registered at import time: the font is only resolved
+the first time a resume actually contains text Helvetica cannot show. The
+resolved path is remembered in a small on-disk cache so later runs skip
+probing and parsing candidates; the cache is re-checked against the
+candidate list, the file's mtime and any higher-priority candidate
+installed since. The ReportLab registration is done at most once per
+process.
+
+Paragraph text is split into runs the base Helvetica family can encode
+(WinAnsi) and runs it cannot; only the latter (CJK, Cyrillic, Greek,
+symbols) are set in the TTF, while Latin text (including bold) keeps the
+base family. Run splitting is memoized, since the same strings (skill
+names, section labels, dates) recur across paragraphs and documents.
+"""
+import os
+import re
+import json
+from functools import lru_cache
+from pathlib import Path
+from reportlab.pdfbase import pdfmetrics
+
+DEFAULT_FONT = 'Helvetica'
+DEFAULT_FONT_BOLD = 'Helvetica-Bold'
+CJK_FONT_NAME = 'ChineseFont'
+
+FONT_PATHS = [
+    # Linux paths
+    '/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc',
+    '/usr/share/fonts/truetype/wqy/wqy-microhei.ttc',
+    '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+    # More Linux paths
+    '/usr/share/fonts/truetype/arphic/uming.ttc',
+    '/usr/share/fonts/truetype/arphic/ukai.ttc',
+    # Noto fonts (commonly available)
+    '/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/google-noto-cjk/NotoSansCJK-Regular.ttc',
+]
+
+FONT_CACHE_FILE = Path(os.environ.get(
+    'RESUME_FONT_CACHE',
+    Path.home() / '.cache' / 'resume-gen' / 'fonts.json',
+))
+
+# Registered font name for this process, None until first resolved
+_cjk_font = None
+
+# Resolved font file for this process, _UNRESOLVED until first probed
+_UNRESOLVED = object()
+_cjk_path = _UNRESOLVED
+
+
+# Characters the base Helvetica family can show: the standard Type 1 fonts are
+# WinAnsi (cp1252) encoded. Anything else (CJK, but also Cyrillic, Greek and
+# symbols such as ★ ● ① ℃) is set in the TTF instead of falling back to
+# ZapfDingbats boxes.
+_BASE_CHARS = ''.join(sorted(set(bytes(range(256)).decode('cp1252', errors='ignore'))))
+_NON_BASE = '[^' + ''.join(re.escape(c) for c in _BASE_CHARS) + ']'
+# Spaces between two such runs stay inside one run, saving a font switch
+_CJK_RUN = re.compile(f'{_NON_BASE}+(?: +{_NON_BASE}+)*')
+
+
+def has_cjk(text: str) -> bool:
+    """Check whether a string has characters the base font cannot encode"""
+    return _CJK_RUN.search(text) is not None
+
+
+# Only CJK unified ideographs decide whether a resume is Chinese; kana,
+# hangul, CJK punctuation and fullwidth forms just need the CJK face
+_CHINESE_CHAR = re.compile('[\u4e00-\u9fff]')
+
+
+def has_chinese(text: str) -> bool:
+    """Check whether a string contains a Chinese ideograph"""
+    return _CHINESE_CHAR.search(text) is not None
+
+
+@lru_cache(maxsize=8192)
+def script_runs(text: str) -> tuple:
+    """Split text into ``(is_cjk, run)`` pairs, in order.
+
+    ``is_cjk`` marks runs the base font cannot encode, which need the TTF.
+    """
+    runs = []
+    pos = 0
+    for match in _CJK_RUN.finditer(text):
+        if match.start() > pos:
+            runs.append((False, text[pos:match.start()]))
+        runs.append((True, match.group()))
+        pos = match.end()
+    if pos < len(text):
+        runs.append((False, text[pos:]))
+    return tuple(runs)
+
+
+@lru_cache(maxsize=8192)
+def font_runs_markup(text: str, cjk_font: str) -> str:
+    """Wrap every CJK run of paragraph markup in ``<font name=cjk_font>``.
+
+    Markup tags are ASCII, so they always fall inside Latin runs and are
+    left untouched.
+    """
+    return ''.join(
+        f'<font name="{cjk_font}">{run}</font>' if is_cjk else run
+        for is_cjk, run in script_runs(text)
+    )
+
+
+def data_has_cjk(value) -> bool:
+    """Recursively check resume data (dicts, lists, strings) for text that needs the TTF"""
+    if isinstance(value, str):
+        return has_cjk(value)
+    if isinstance(value, dict):
+        return any(has_cjk(k) or data_has_cjk(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return any(data_has_cjk(v) for v in value)
+    return False
+
+
+def _mtime(path: str):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _read_cached_path():
+    """Return the cached font path if it is still the best candidate.
+
+    The cache is only trusted for the same FONT_PATHS list, while the file
+    keeps its mtime and no higher-priority candidate has appeared since
+    (other than ones already found unusable, at the same mtime). The extra
+    stats are cheap next to probing and parsing fonts.
+    """
+    try:
+        cached = json.loads(FONT_CACHE_FILE.read_text(encoding='utf-8'))
+        path = cached['path']
+        if cached['candidates'] != FONT_PATHS or _mtime(path) != cached['mtime']:
+            return None
+        unusable = cached.get('unusable', {})
+        for better in FONT_PATHS[:FONT_PATHS.index(path)]:
+            mtime = _mtime(better)
+            if mtime is not None and unusable.get(better) != mtime:
+                return None
+        return path
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _write_cached_path(path: str, unusable=()):
+    """Persist the resolved font path; a read-only home is not an error"""
+    try:
+        FONT_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        FONT_CACHE_FILE.write_text(
+            json.dumps({
+                'path': path,
+                'mtime': os.stat(path).st_mtime,
+                'candidates': FONT_PATHS,
+                'unusable': {p: _mtime(p) for p in unusable},
+            }),
+            encoding='utf-8',
+        )
+    except OSError:
+        pass
+
+
+def _register(path: str) -> bool:
+    # Imported here so that --help and Latin-only runs never load the TTF parser
+    from reportlab.pdfbase.ttfonts import TTFont
+    try:
+        pdfmetrics.registerFont(TTFont(CJK_FONT_NAME, path))
+        return True
+    except Exception:
+        return False
+
+
+def resolve_cjk_font_path():
+    """Find the CJK font file without registering it, or None if there is none"""
+    global _cjk_path
+    if _cjk_path is _UNRESOLVED:
+        _cjk_path = _read_cached_path()
+        if _cjk_path is None:
+            _cjk_path = next((p for p in FONT_PATHS if Path(p).exists()), None)
+            if _cjk_path is not None:
+                _write_cached_path(_cjk_path)
+    return _cjk_path
+
+
+def get_cjk_font() -> str:
+    """Resolve and register the CJK font once per process.
+
+    Returns the registered font name, or Helvetica when no CJK font is
+    available on this machine.
+    """
+    global _cjk_font, _cjk_path
+    if _cjk_font is not None:
+        return _cjk_font
+
+    # Already registered in this process (e.g. by another importer)
+    if CJK_FONT_NAME in pdfmetrics.getRegisteredFontNames():
+        _cjk_font = CJK_FONT_NAME
+        return _cjk_font
+
+    path = resolve_cjk_font_path()
+    if path and _register(path):
+        _cjk_font = CJK_FONT_NAME
+        return _cjk_font
+
+    # The resolved file could not be parsed; fall back to the next candidates
+    _cjk_font = DEFAULT_FONT
+    unusable = [path] if path else []
+    for font_path in FONT_PATHS:
+        if font_path in unusable or not Path(font_path).exists():
+            continue
+        if _register(font_path):
+            _write_cached_path(font_path, unusable)
+            _cjk_path = font_path
+            _cjk_font = CJK_FONT_NAME
+            break
+        unusable.append(font_path)
+    return _cjk_font
+
+
+def font_for(data: dict) -> str:
+    """Pick the font for a resume: CJK only when its content needs it"""
+    return get_cjk_font() if data_has_cjk(data) else DEFAULT_FONT
+
+
+def font_identity(data: dict) -> str:
+    """Describe the font a resume would use, without touching ReportLab.
+
+    Used in cache keys: changes whenever the font file is swapped or updated.
+    """
+    if not data_has_cjk(data):
+        return DEFAULT_FONT
+    path = resolve_cjk_font_path()
+    if path is None:
+        return DEFAULT_FONT
+    try:
+        return f"{path}@{os.stat(path).st_mtime}"
+    except OSError:
+        return path
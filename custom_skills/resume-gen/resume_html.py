@@ -0,0 +1,115 @@
+"""
+HTML output for the resume generator.
+
+Renders the same normalized resume, theme palette and layout as the PDF
+into one self-contained page (inline CSS, no external assets). Browsers
+fall back per glyph to an installed CJK font, so mixed Latin/CJK text needs
+no run splitting here.
+"""
+import html
+from string import Template
+
+_CSS = Template("""
+body { font-family: Helvetica, Arial, "Noto Sans CJK SC", "PingFang SC", "Microsoft YaHei", sans-serif;
+       color: $text; max-width: 170mm; margin: 15mm auto; font-size: 10pt; line-height: 1.4; }
+header { text-align: $align; }
+h1 { color: $primary; font-size: 24pt; font-weight: normal; margin: 0 0 2mm; }
+.title { color: $light; font-size: 12pt; margin: 0 0 3mm; }
+.contact { color: $light; font-size: 9pt; margin: 0; }
+hr { border: none; border-top: 1px solid $accent; margin: 5mm 0 3mm; }
+h2 { color: $primary; font-size: 14pt; font-weight: normal; margin: 5mm 0 3mm; $section_rule }
+.row { display: flex; justify-content: space-between; font-size: 11pt; }
+.dates { color: $light; font-size: 9pt; white-space: nowrap; }
+.role { color: $secondary; margin: 0; }
+ul { margin: 1mm 0 3mm; padding-left: 5mm; }
+li { margin-top: 1mm; }
+""")
+
+
+def _row(heading: str, dates: str) -> str:
+    return f'<div class="row"><span>{heading}</span><span class="dates">{dates}</span></div>'
+
+
+def _bullets(items) -> str:
+    if not items:
+        return ''
+    return '<ul>' + ''.join(f'<li>{item}</li>' for item in items) + '</ul>'
+
+
+def render_html(generator) -> bytes:
+    """Render a ResumeGenerator's resume as a standalone HTML page"""
+    resume = generator.resume.map_text(html.escape)
+    layout = generator.layout
+    title = generator.section_title
+    header = resume.header
+
+    css = _CSS.substitute(
+        generator.hex_colors,
+        align='center' if layout == 'modern' else 'left',
+        section_rule=f"border-bottom: 0.5px solid {generator.hex_colors['light']};" if layout == 'classic' else '',
+    )
+    parts = [
+        '<!DOCTYPE html>\n',
+        f'<html lang="{"zh" if generator._is_chinese() else "en"}">',
+        f'<head><meta charset="utf-8"><title>{header.name or "Resume"}</title><style>{css}</style></head>',
+        '<body><header>',
+    ]
+
+    if header.name:
+        parts.append(f'<h1>{header.name}</h1>')
+    if header.title:
+        parts.append(f'<p class="title">{header.title}</p>')
+    for line in ((header.email, header.phone, header.location), (header.linkedin, header.github)):
+        line = [part for part in line if part]
+        if line:
+            parts.append(f'<p class="contact">{" | ".join(line)}</p>')
+    parts.append('</header>')
+    if layout != 'minimal':
+        parts.append('<hr>')
+
+    if resume.summary:
+        parts.append(f'<h2>{title("summary")}</h2><p>{resume.summary}</p>')
+
+    if resume.experience:
+        parts.append(f'<h2>{title("experience")}</h2>')
+        for job in resume.experience:
+            heading = f'<b>{job.company}</b>' + (f' - {job.location}' if job.location else '')
+            parts.append(_row(heading, f'{job.start_date} - {job.end_date}'))
+            if job.title:
+                parts.append(f'<p class="role">{job.title}</p>')
+            parts.append(_bullets(job.highlights))
+
+    if resume.education:
+        parts.append(f'<h2>{title("education")}</h2>')
+        for edu in resume.education:
+            parts.append(_row(f'<b>{edu.institution}</b>', f'{edu.start_date} - {edu.end_date}'))
+            degree = edu.degree + (f' | GPA: {edu.gpa}' if edu.gpa else '')
+            parts.append(f'<p class="role">{degree}</p>')
+
+    if resume.skills:
+        parts.append(f'<h2>{title("skills")}</h2>')
+        if resume.grouped_skills:
+            parts.append(_bullets([f'<b>{category}:</b> {", ".join(items)}' for category, items in resume.skills]))
+        else:
+            parts.append(f'<p>{", ".join(resume.skills)}</p>')
+
+    if resume.projects:
+        parts.append(f'<h2>{title("projects")}</h2>')
+        for project in resume.projects:
+            parts.append(f'<p><b>{project.name}</b></p>')
+            if project.description:
+                parts.append(f'<p class="role">{project.description}</p>')
+            parts.append(_bullets(project.highlights))
+
+    if resume.certifications:
+        parts.append(f'<h2>{title("certifications")}</h2>')
+        parts.append(_bullets([
+            f'<b>{cert.name}</b>' + (f' ({cert.date})' if cert.date else '') for cert in resume.certifications
+        ]))
+
+    if resume.languages:
+        parts.append(f'<h2>{title("languages")}</h2>')
+        parts.append(f'<p>{" | ".join(f"{l.language}: {l.proficiency}" for l in resume.languages)}</p>')
+
+    parts.append('</body></html>\n')
+    return ''.join(parts).encode('utf-8')
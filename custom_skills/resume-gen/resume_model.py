@@ -0,0 +1,208 @@
+"""
+Validation and normalization of resume JSON.
+
+``parse_resume()`` turns the raw dict into typed, ``__slots__``-based
+records in a single pass, so the section builders never have to poke into
+the dict with ``.get()`` and malformed input is rejected before any
+ReportLab work. Every problem found is collected, with a JSON path, into
+one ``ResumeValidationError``.
+
+Text fields are normalized to ``str`` (numbers are accepted and converted,
+missing values become ``''``); list fields become tuples. ``map_text()``
+derives a copy with a function applied to every text value, e.g. to escape
+markup for one output format without touching the model others read.
+"""
+
+
+class ResumeValidationError(ValueError):
+    """Raised with every problem found in a resume record"""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        details = '; '.join(f"{path}: {message}" for path, message in self.errors)
+        super().__init__(f"Invalid resume data ({len(self.errors)} problem(s)): {details}")
+
+    def __reduce__(self):
+        return self.__class__, (self.errors,)
+
+    def to_list(self) -> list:
+        return [{'path': path, 'message': message} for path, message in self.errors]
+
+
+class _Record:
+    """Base for section records: ``TEXT`` fields are strings, ``LISTS`` are tuples of strings"""
+    __slots__ = ()
+    TEXT = ()
+    LISTS = ()
+
+    def __init__(self, **values):
+        for name in self.TEXT:
+            setattr(self, name, values.get(name, ''))
+        for name in self.LISTS:
+            setattr(self, name, values.get(name, ()))
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{self.__class__.__name__}({fields})"
+
+    def map_text(self, fn):
+        """Copy of the record with ``fn`` applied to every text value"""
+        values = {name: fn(getattr(self, name)) for name in self.TEXT}
+        for name in self.LISTS:
+            values[name] = tuple(map(fn, getattr(self, name)))
+        return self.__class__(**values)
+
+
+class Header(_Record):
+    __slots__ = TEXT = ('name', 'title', 'email', 'phone', 'location', 'linkedin', 'github')
+
+
+class Job(_Record):
+    TEXT = ('company', 'title', 'location', 'start_date', 'end_date')
+    LISTS = ('highlights',)
+    __slots__ = TEXT + LISTS
+
+
+class Education(_Record):
+    __slots__ = TEXT = ('institution', 'degree', 'start_date', 'end_date', 'gpa')
+
+
+class Project(_Record):
+    TEXT = ('name', 'description')
+    LISTS = ('highlights',)
+    __slots__ = TEXT + LISTS
+
+
+class Certification(_Record):
+    __slots__ = TEXT = ('name', 'date')
+
+
+class Language(_Record):
+    __slots__ = TEXT = ('language', 'proficiency')
+
+
+class Resume:
+    """Normalized resume.
+
+    ``skills`` is either a tuple of ``(category, skills)`` pairs (grouped
+    skills) or a flat tuple of strings, mirroring the two JSON forms.
+    """
+    __slots__ = ('style', 'header', 'summary', 'experience', 'education',
+                 'skills', 'projects', 'certifications', 'languages')
+
+    def __init__(self, style='modern', header=None, summary='', experience=(), education=(),
+                 skills=(), projects=(), certifications=(), languages=()):
+        self.style = style
+        self.header = header or Header()
+        self.summary = summary
+        self.experience = experience
+        self.education = education
+        self.skills = skills
+        self.projects = projects
+        self.certifications = certifications
+        self.languages = languages
+
+    @property
+    def grouped_skills(self) -> bool:
+        return bool(self.skills) and isinstance(self.skills[0], tuple)
+
+    def map_text(self, fn) -> 'Resume':
+        """Copy of the resume with ``fn`` applied to every text value"""
+        if self.grouped_skills:
+            skills = tuple((fn(category), tuple(map(fn, items))) for category, items in self.skills)
+        else:
+            skills = tuple(map(fn, self.skills))
+        return Resume(
+            style=self.style,
+            header=self.header.map_text(fn),
+            summary=fn(self.summary),
+            skills=skills,
+            **{key: tuple(record.map_text(fn) for record in getattr(self, key)) for key in _SECTIONS},
+        )
+
+
+# JSON key -> record class for the list sections
+_SECTIONS = {
+    'experience': Job,
+    'education': Education,
+    'projects': Project,
+    'certifications': Certification,
+    'languages': Language,
+}
+
+
+def _text(value, path, errors) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    errors.append((path, f"expected a string, got {type(value).__name__}"))
+    return ''
+
+
+def _text_list(value, path, errors) -> tuple:
+    if value is None:
+        return ()
+    if not isinstance(value, list):
+        errors.append((path, f"expected a list of strings, got {type(value).__name__}"))
+        return ()
+    return tuple(_text(item, f"{path}[{i}]", errors) for i, item in enumerate(value))
+
+
+def _record(cls, value, path, errors):
+    if not isinstance(value, dict):
+        errors.append((path, f"expected an object, got {type(value).__name__}"))
+        return None
+    fields = {name: _text(value.get(name), f"{path}.{name}", errors) for name in cls.TEXT}
+    for name in cls.LISTS:
+        fields[name] = _text_list(value.get(name), f"{path}.{name}", errors)
+    return cls(**fields)
+
+
+def _records(cls, value, path, errors) -> tuple:
+    if value is None:
+        return ()
+    if not isinstance(value, list):
+        errors.append((path, f"expected a list, got {type(value).__name__}"))
+        return ()
+    return tuple(_record(cls, item, f"{path}[{i}]", errors) for i, item in enumerate(value))
+
+
+def _skills(value, errors) -> tuple:
+    if value is None:
+        return ()
+    if isinstance(value, dict):
+        groups = []
+        for category, skill_list in value.items():
+            if isinstance(skill_list, str):
+                skill_list = [skill_list]
+            groups.append((category, _text_list(skill_list, f"skills.{category}", errors)))
+        return tuple(groups)
+    if isinstance(value, list):
+        return _text_list(value, 'skills', errors)
+    errors.append(('skills', f"expected an object or a list, got {type(value).__name__}"))
+    return ()
+
+
+def parse_resume(data) -> Resume:
+    """Validate resume JSON and normalize it into a Resume.
+
+    Raises ResumeValidationError listing every problem found.
+    """
+    if not isinstance(data, dict):
+        raise ResumeValidationError([('$', f"expected an object, got {type(data).__name__}")])
+
+    errors = []
+    header = _record(Header, data.get('header') or {}, 'header', errors)
+    resume = Resume(
+        style=_text(data.get('style'), 'style', errors) or 'modern',
+        header=header,
+        summary=_text(data.get('summary'), 'summary', errors),
+        skills=_skills(data.get('skills'), errors),
+        **{key: _records(cls, data.get(key), key, errors) for key, cls in _SECTIONS.items()},
+    )
+    if errors:
+        raise ResumeValidationError(errors)
+    return resume
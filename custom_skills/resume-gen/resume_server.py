@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Resident resume render server.
+
+Keeps a pool of warm worker processes (fonts registered, style sheets built)
+and renders resume JSON posted over local HTTP or a Unix socket:
+
+    POST /render     resume JSON body -> application/pdf
+    GET  /healthz    liveness check, 503 while the worker pool is restarting
+    GET  /metrics    request counters and latency as JSON
+
+At most ``--max-queue`` renders may be pending at once; further requests are
+rejected with 503 and a Retry-After header instead of piling up. Requests
+that take longer than ``--timeout`` seconds get a 504. A job still waiting in
+the pool is cancelled; one already running cannot be interrupted mid-layout,
+so it keeps its queue slot until the worker finishes it. If a worker dies
+(OOM kill, segfault) the pool is rebuilt and warmed in the background;
+renders get a 503 until it is back.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import socketserver
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import generate_resume
+from generate_resume import ResumeGenerator, _init_batch_worker
+from resume_cache import DEFAULT_MAX_BYTES
+from resume_model import ResumeValidationError, parse_resume
+
+MAX_BODY_BYTES = 1024 * 1024
+
+
+def _render_job(data: dict) -> bytes:
+    """Render one resume inside a warm worker process"""
+    generator = ResumeGenerator(data, data.get('style', 'modern'))
+    return generator.render_bytes(generate_resume._batch_cache)
+
+
+def _ping() -> int:
+    """No-op job used to start (and so warm up) a worker process"""
+    return os.getpid()
+
+
+class RenderService:
+    """Process pool plus the admission control and metrics around it"""
+
+    def __init__(self, workers: int = None, max_queue: int = 64, timeout: float = 30.0,
+                 cache_dir: str = None, cache_bytes: int = DEFAULT_MAX_BYTES):
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.max_queue = max_queue
+        self._initargs = (cache_dir, cache_bytes)
+        self._slots = threading.BoundedSemaphore(max_queue)
+        self._lock = threading.Lock()
+        self._pool_lock = threading.Lock()
+        self._restarting = False
+        self.started = time.time()
+        self.counters = {
+            'requests': 0, 'rendered': 0, 'rejected': 0,
+            'timeouts': 0, 'errors': 0, 'in_flight': 0, 'pool_restarts': 0,
+        }
+        self._render_seconds = 0.0
+        self.pool = self._start_pool()
+
+    def _start_pool(self) -> ProcessPoolExecutor:
+        """Start a pool and wait until every worker is forked and warm.
+
+        ProcessPoolExecutor only starts workers on submit, so without this
+        the first requests would pay the cold start the server exists to avoid.
+        """
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_batch_worker,
+            initargs=self._initargs,
+        )
+        try:
+            for future in [pool.submit(_ping) for _ in range(self.workers)]:
+                future.result()
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        return pool
+
+    def _restart_pool(self, broken: ProcessPoolExecutor):
+        """Replace a broken pool in the background (once, however many requests notice)"""
+        with self._pool_lock:
+            if self.pool is not broken or self._restarting:
+                return
+            self._restarting = True
+        broken.shutdown(wait=False, cancel_futures=True)
+        threading.Thread(target=self._rebuild_pool, daemon=True).start()
+
+    def _rebuild_pool(self):
+        while True:
+            try:
+                pool = self._start_pool()
+                break
+            except BrokenProcessPool:
+                time.sleep(1.0)
+        with self._pool_lock:
+            self.pool = pool
+            self._restarting = False
+        self._count('pool_restarts')
+
+    def _live_pool(self):
+        """The current pool, or None while it is being rebuilt"""
+        with self._pool_lock:
+            pool = None if self._restarting else self.pool
+        if pool is not None and pool._broken:
+            self._restart_pool(pool)
+            return None
+        return pool
+
+    @property
+    def healthy(self) -> bool:
+        return self._live_pool() is not None
+
+    def _count(self, name: str, delta: int = 1):
+        with self._lock:
+            self.counters[name] += delta
+
+    def render(self, data: dict):
+        """Render a resume, returning (status, pdf_bytes_or_error_message)"""
+        self._count('requests')
+        pool = self._live_pool()
+        if pool is None:
+            self._count('rejected')
+            return 503, "render pool is restarting"
+        if not self._slots.acquire(blocking=False):
+            self._count('rejected')
+            return 503, "render queue is full"
+
+        self._count('in_flight')
+        start = time.perf_counter()
+        try:
+            future = pool.submit(_render_job, data)
+        except BrokenProcessPool:
+            self._release()
+            self._restart_pool(pool)
+            self._count('rejected')
+            return 503, "render pool is restarting"
+        except Exception:
+            self._release()
+            raise
+        # The slot is freed when the job finishes or is cancelled, not when
+        # the request gives up on it, so timed-out jobs still count
+        future.add_done_callback(self._release)
+        try:
+            pdf = future.result(timeout=self.timeout)
+        except FutureTimeout:
+            future.cancel()
+            self._count('timeouts')
+            return 504, f"render exceeded {self.timeout:g}s"
+        except BrokenProcessPool:
+            self._count('errors')
+            self._restart_pool(pool)
+            return 503, "render worker died; restarting the pool"
+        except Exception as e:
+            # Invalid resumes are rejected before submit, so this is a server fault
+            self._count('errors')
+            return 500, str(e) or e.__class__.__name__
+        with self._lock:
+            self.counters['rendered'] += 1
+            self._render_seconds += time.perf_counter() - start
+        return 200, pdf
+
+    def _release(self, future=None):
+        self._count('in_flight', -1)
+        self._slots.release()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            stats = dict(self.counters)
+            rendered = stats['rendered']
+            stats['avg_render_ms'] = 1000 * self._render_seconds / rendered if rendered else 0.0
+        stats['workers'] = self.workers
+        stats['max_queue'] = self.max_queue
+        stats['uptime_s'] = round(time.time() - self.started, 1)
+        stats['pool'] = 'ok' if self.healthy else 'restarting'
+        return stats
+
+    def shutdown(self):
+        with self._pool_lock:
+            pool = self.pool
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+    server_version = 'ResumeRender/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def service(self) -> RenderService:
+        return self.server.service
+
+    def address_string(self):
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: dict = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: dict, headers: dict = None):
+        self._send(status, json.dumps(payload).encode('utf-8'), 'application/json', headers)
+
+    def do_GET(self):
+        if self.path == '/healthz':
+            if self.service.healthy:
+                self._send_json(200, {'status': 'ok', 'workers': self.service.workers})
+            else:
+                self._send_json(503, {'status': 'restarting'}, {'Retry-After': '1'})
+        elif self.path == '/metrics':
+            self._send_json(200, self.service.metrics())
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self.path != '/render':
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            self._send_json(400, {'error': 'invalid Content-Length'})
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send_json(413, {'error': 'request body too large'})
+            return
+        try:
+            data = json.loads(self.rfile.read(length))
+        except ValueError as e:
+            self._send_json(400, {'error': f"invalid JSON: {e}"})
+            return
+        if not isinstance(data, dict):
+            self._send_json(400, {'error': "resume record must be a JSON object"})
+            return
+        # Reject malformed resumes here instead of spending a worker on them
+        try:
+            parse_resume(data)
+        except ResumeValidationError as e:
+            self._send_json(422, {'error': 'invalid resume data', 'problems': e.to_list()})
+            return
+
+        status, result = self.service.render(data)
+        if status == 200:
+            self._send(200, result, 'application/pdf')
+        elif status == 503:
+            self._send_json(503, {'error': result}, {'Retry-After': '1'})
+        else:
+            self._send_json(status, {'error': result})
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(service: RenderService, host: str = '127.0.0.1', port: int = 8765,
+          unix_socket: str = None):
+    """Serve until interrupted"""
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.unlink(unix_socket)
+        server = UnixHTTPServer(unix_socket, RenderHandler)
+        where = f"unix:{unix_socket}"
+    else:
+        server = ThreadingHTTPServer((host, port), RenderHandler)
+        where = f"http://{host}:{port}"
+    server.service = service
+
+    print(f"Resume render server listening on {where} ({service.workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+        if unix_socket and os.path.exists(unix_socket):
+            os.unlink(unix_socket)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve resume PDF rendering over HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix-socket', default=None, help="listen on a Unix socket instead of TCP")
+    parser.add_argument('--workers', type=int, default=None, help="render processes (default: CPU count)")
+    parser.add_argument('--max-queue', type=int, default=64, help="pending renders before rejecting with 503")
+    parser.add_argument('--timeout', type=float, default=30.0, help="per-request render timeout in seconds")
+    parser.add_argument('--cache-dir', default=None, help="reuse PDFs of unchanged resumes from this directory")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="render cache size limit in MB (default: %(default)s)")
+    args = parser.parse_args()
+
+    if args.max_queue < 1:
+        print("Error: --max-queue must be at least 1")
+        sys.exit(1)
+
+    service = RenderService(args.workers, args.max_queue, args.timeout,
+                            args.cache_dir, args.cache_size * 1024 * 1024)
+    serve(service, args.host, args.port, args.unix_socket)
+
+
+if __name__ == "__main__":
+    main()
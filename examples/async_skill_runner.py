@@ -0,0 +1,192 @@
+"""
+异步 Agentic Loop 运行器：基于 AsyncAnthropic 并发运行多个 Skill 会话
+
+每个会话仍是 "请求 -> 处理 tool result -> 继续" 的循环，但多个会话在同一个
+事件循环里并发执行，并发数由 concurrency 限制。每收到一轮响应，其中的文件
+会立即开始后台下载，不必等整个会话结束；同一个 file_id 在后续轮次再次出现时
+不会重复下载。下载与 DownloadManager 一样按块流式写入 .part 文件，失败时
+按指数退避重试并用 Range 请求续传。
+
+可以传入自定义 client（或 base_url）指向本地的 API 替身进行测试。
+"""
+import asyncio
+import os
+import random
+from pathlib import Path
+from anthropic import AsyncAnthropic
+from skill_downloads import is_retryable
+from skill_session import BETAS, CODE_EXECUTION_TOOL, FILES_BETA, MODEL, anthropic_skill, iter_file_ids
+
+
+class SkillJob:
+    """一个 Skill 会话任务"""
+
+    def __init__(self, prompt: str, skills: list, output: str = None, name: str = None):
+        # skills: [anthropic_skill("docx"), custom_skill("skill_..."), ...]
+        self.prompt = prompt
+        self.skills = skills
+        self.output = output
+        self.name = name or output or "job"
+
+
+class JobResult:
+    """会话结果：最后一轮响应、保存的文件，以及失败时的异常"""
+
+    def __init__(self, job: SkillJob, response=None, files=None, error: Exception = None):
+        self.job = job
+        self.response = response
+        self.files = files or []
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class AsyncSkillRunner:
+    def __init__(self, client: AsyncAnthropic = None, concurrency: int = 4,
+                 output_dir: str = ".", model: str = MODEL, max_tokens: int = 16000,
+                 base_url: str = None, on_text=None, download_retries: int = 3,
+                 chunk_size: int = 1 << 20, backoff: float = 0.5):
+        self.client = client or AsyncAnthropic(base_url=base_url)
+        self.concurrency = concurrency
+        self.output_dir = Path(output_dir)
+        self.model = model
+        self.max_tokens = max_tokens
+        self.on_text = on_text or (lambda job, text: print(f"[{job.name}] Claude: {text}"))
+        self.download_retries = download_retries
+        self.chunk_size = chunk_size
+        self.backoff = backoff
+
+    def _output_path(self, job: SkillJob, filename: str, index: int) -> Path:
+        """第一个文件使用 job.output，之后的文件加序号后缀"""
+        if job.output:
+            path = Path(job.output)
+            if index > 0:
+                path = path.with_name(f"{path.stem}_{index + 1}{path.suffix}")
+        else:
+            path = Path(Path(filename).name)
+        return self.output_dir / path
+
+    async def _download(self, job: SkillJob, file_id: str, index: int) -> Path:
+        filename = file_id
+        if not job.output:
+            metadata = await self.client.beta.files.retrieve_metadata(
+                file_id=file_id, betas=[FILES_BETA]
+            )
+            filename = metadata.filename
+        path = self._output_path(job, filename, index)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(path.name + ".part")
+        # 磁盘上已有的 .part 可能来自之前崩溃的运行或同名的其他文件，不能续传
+        partial.unlink(missing_ok=True)
+
+        attempt = 0
+        while True:
+            try:
+                await self._stream_to(file_id, partial)
+                break
+            except Exception as e:
+                if attempt >= self.download_retries or not is_retryable(e):
+                    raise
+                attempt += 1
+                delay = self.backoff * (2 ** (attempt - 1))
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+        os.replace(partial, path)
+        print(f"✅ [{job.name}] 文件已保存: {path}")
+        return path
+
+    async def _stream_to(self, file_id: str, partial: Path):
+        """把文件流式写入 partial；本次下载已写入部分内容时用 Range 请求续传"""
+        offset = partial.stat().st_size if partial.exists() else 0
+        extra_headers = {"Range": f"bytes={offset}-"} if offset else None
+        async with self.client.beta.files.with_streaming_response.download(
+            file_id=file_id,
+            betas=[FILES_BETA],
+            extra_headers=extra_headers,
+        ) as response:
+            # 服务端忽略 Range 时返回完整内容（200），从头写入
+            mode = "ab" if offset and response.status_code == 206 else "wb"
+            with open(partial, mode) as f:
+                try:
+                    async for chunk in response.iter_bytes(self.chunk_size):
+                        f.write(chunk)
+                except Exception as e:
+                    # 传输中断：保留已写入的部分，交给上层决定是否续传
+                    raise OSError(f"下载 {file_id} 时连接中断: {e}") from e
+
+    async def run(self, job: SkillJob) -> JobResult:
+        """运行单个会话的 agentic loop"""
+        messages = [{"role": "user", "content": job.prompt}]
+        downloads = {}  # file_id -> 下载任务，同一个文件只下载一次
+        try:
+            while True:
+                response = await self.client.beta.messages.create(
+                    model=self.model,
+                    max_tokens=self.max_tokens,
+                    betas=BETAS,
+                    container={"skills": job.skills},
+                    tools=[CODE_EXECUTION_TOOL],
+                    messages=messages,
+                )
+
+                for block in response.content:
+                    if block.type == "text":
+                        self.on_text(job, block.text)
+                    # 文件一出现就开始下载，与后续轮次并行
+                    for file_id in iter_file_ids(block):
+                        if file_id not in downloads:
+                            downloads[file_id] = asyncio.create_task(
+                                self._download(job, file_id, len(downloads))
+                            )
+
+                if response.stop_reason == "end_turn":
+                    break
+
+                messages.append({"role": "assistant", "content": response.content})
+                messages.append({"role": "user", "content": [{"type": "text", "text": "继续"}]})
+
+            files = await asyncio.gather(*downloads.values())
+            return JobResult(job, response, list(files))
+        except Exception as e:
+            for task in downloads.values():
+                task.cancel()
+            return JobResult(job, error=e)
+
+    async def run_many(self, jobs: list) -> list:
+        """并发运行多个会话（最多 concurrency 个同时进行），按输入顺序返回结果"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def limited(job):
+            async with semaphore:
+                return await self.run(job)
+
+        return await asyncio.gather(*(limited(job) for job in jobs))
+
+
+async def main():
+    jobs = [
+        SkillJob(
+            "创建一个 Excel 销售报表，包含产品名称、数量、单价、总额四列和 5 行示例数据",
+            [anthropic_skill("xlsx")],
+            output="sales_report.xlsx",
+        ),
+        SkillJob(
+            "创建一份 Word 文档：智能客服系统项目提案，包含背景、目标和里程碑表格",
+            [anthropic_skill("docx")],
+            output="project_proposal.docx",
+        ),
+    ]
+
+    runner = AsyncSkillRunner(concurrency=2)
+    for result in await runner.run_many(jobs):
+        if result.ok:
+            print(f"🎉 {result.job.name}: {len(result.files)} 个文件")
+        else:
+            print(f"❌ {result.job.name}: {result.error}")
+
+
+if __name__ == "__main__":
+    print("🚀 并发运行多个 Skill 会话...")
+    asyncio.run(main())
@@ -0,0 +1,234 @@
+"""
+Message Batches 模式：批量提交对延迟不敏感的 Skill 文档生成任务
+
+适用于夜间批量生成月报、报表等场景：所有任务打包为一个 Message Batch 提交，
+按退避间隔轮询直到批处理结束；stop_reason 不是 "end_turn" 的结果带上历史
+（和容器 ID）进入下一个批次继续，直到全部完成。每个批次结果中的文件立即交给
+DownloadManager 并行下载。
+
+可以传入自定义 client（或 base_url）指向本地的批处理 API 替身进行测试。
+
+用法：
+
+    jobs = [SkillJob("生成 1 月月报 ...", [anthropic_skill("pdf")], output="report_01.pdf"), ...]
+    results = SkillBatchRunner(output_dir="reports").run(jobs)
+"""
+import time
+from pathlib import Path
+from anthropic import Anthropic
+from async_skill_runner import JobResult, SkillJob
+from skill_downloads import DownloadManager
+from skill_history import ConversationHistory
+from skill_session import BETAS, CODE_EXECUTION_TOOL, FILES_BETA, MODEL, anthropic_skill, iter_file_ids
+
+
+class _BatchTask:
+    """一个任务在多个批次之间的状态"""
+
+    def __init__(self, index: int, job: SkillJob, history: ConversationHistory):
+        self.custom_id = f"job-{index}"
+        self.job = job
+        self.history = history
+        self.container_id = None
+        self.turns = 0
+        self.response = None
+        self.downloads = []
+        self.error = None
+
+
+class SkillBatchRunner:
+    """通过 Message Batches API 运行多个 Skill 会话
+
+    poll_interval / max_poll_interval: 轮询间隔从 poll_interval 开始按 backoff 倍数增长，
+                                       最大 max_poll_interval 秒
+    timeout: 单个批次的最长等待时间（秒），超时后取消批次并抛出 TimeoutError
+    max_turns: 每个任务最多的请求轮数（即最多参与几个批次）
+    download_workers: 并行下载文件的线程数
+    cache: 为 tools 声明和首条指令加 cache_control 断点（批处理同样支持 prompt caching）
+    """
+
+    def __init__(self, client: Anthropic = None, model: str = MODEL, max_tokens: int = 16000,
+                 output_dir: str = ".", base_url: str = None, poll_interval: float = 5.0,
+                 max_poll_interval: float = 60.0, backoff: float = 1.5, timeout: float = None,
+                 max_turns: int = None, download_workers: int = 8, cache: bool = True,
+                 on_text=None, on_status=None):
+        self.client = client or Anthropic(base_url=base_url)
+        self.model = model
+        self.max_tokens = max_tokens
+        self.output_dir = Path(output_dir)
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.backoff = backoff
+        self.timeout = timeout
+        self.max_turns = max_turns
+        self.download_workers = download_workers
+        self.cache_control = {"type": "ephemeral"} if cache else None
+        self.on_text = on_text or (lambda job, text: print(f"[{job.name}] Claude: {text}"))
+        self.on_status = on_status or (lambda batch: print(
+            f"⏳ 批次 {batch.id}: {batch.processing_status} {_format_counts(batch)}"
+        ))
+
+    def _request(self, task: _BatchTask) -> dict:
+        """构建批次中的一条请求（betas 在批次级别传入）"""
+        container = {"skills": task.job.skills}
+        if task.container_id:
+            container["id"] = task.container_id
+        tool = dict(CODE_EXECUTION_TOOL)
+        if self.cache_control:
+            tool["cache_control"] = self.cache_control
+        return {
+            "custom_id": task.custom_id,
+            "params": {
+                "model": self.model,
+                "max_tokens": self.max_tokens,
+                "container": container,
+                "tools": [tool],
+                "messages": task.history.messages(),
+            },
+        }
+
+    def submit(self, tasks: list):
+        """提交一个批次"""
+        return self.client.beta.messages.batches.create(
+            requests=[self._request(task) for task in tasks],
+            betas=BETAS,
+        )
+
+    def wait(self, batch_id: str):
+        """轮询直到批次结束；间隔按 backoff 倍数增长"""
+        interval = self.poll_interval
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            batch = self.client.beta.messages.batches.retrieve(batch_id, betas=BETAS)
+            self.on_status(batch)
+            if batch.processing_status == "ended":
+                return batch
+            if deadline is not None and time.monotonic() + interval > deadline:
+                self.client.beta.messages.batches.cancel(batch_id, betas=BETAS)
+                raise TimeoutError(f"批次 {batch_id} 在 {self.timeout} 秒内未完成，已取消")
+            time.sleep(interval)
+            interval = min(interval * self.backoff, self.max_poll_interval)
+
+    def _output_path(self, task: _BatchTask, file_id: str, index: int) -> Path:
+        """第一个文件使用 job.output，之后的文件加序号后缀"""
+        if task.job.output:
+            path = Path(task.job.output)
+            if index > 0:
+                path = path.with_name(f"{path.stem}_{index + 1}{path.suffix}")
+        else:
+            metadata = self.client.beta.files.retrieve_metadata(file_id=file_id, betas=[FILES_BETA])
+            path = Path(Path(metadata.filename).name)
+        return self.output_dir / path
+
+    def _download(self, task: _BatchTask, file_id: str, downloads: DownloadManager):
+        if file_id in downloads:
+            return
+        index = len(task.downloads)
+        task.downloads.append(downloads.submit(
+            file_id,
+            lambda: self._output_path(task, file_id, index),
+            on_done=lambda path: print(f"✅ [{task.job.name}] 文件已保存: {path}"),
+        ))
+
+    def _handle_result(self, task: _BatchTask, result, downloads: DownloadManager) -> bool:
+        """处理一条批次结果，返回该任务是否需要继续下一轮"""
+        if result.type != "succeeded":
+            error = getattr(result, "error", None)
+            detail = getattr(getattr(error, "error", None), "message", None) or result.type
+            task.error = RuntimeError(f"请求失败 ({result.type}): {detail}")
+            return False
+
+        message = result.message
+        task.response = message
+        task.turns += 1
+        task.history.record_usage(message)
+        container = getattr(message, "container", None)
+        if container is not None and getattr(container, "id", None):
+            task.container_id = container.id
+
+        for block in message.content:
+            if block.type == "text":
+                self.on_text(task.job, block.text)
+            for file_id in iter_file_ids(block):
+                self._download(task, file_id, downloads)
+
+        if message.stop_reason == "end_turn":
+            return False
+        if self.max_turns is not None and task.turns >= self.max_turns:
+            return False
+        task.history.add_turn(message)
+        return True
+
+    def run(self, jobs: list) -> list:
+        """运行所有任务，按输入顺序返回 JobResult 列表"""
+        tasks = [
+            _BatchTask(i, job, ConversationHistory(job.prompt, cache_control=self.cache_control))
+            for i, job in enumerate(jobs)
+        ]
+        by_id = {task.custom_id: task for task in tasks}
+        pending = list(tasks)
+
+        downloads = DownloadManager(self.client, workers=self.download_workers)
+        try:
+            while pending:
+                batch = self.submit(pending)
+                print(f"📦 已提交批次 {batch.id}（{len(pending)} 个请求）")
+                self.wait(batch.id)
+
+                answered = set()
+                continuing = []
+                for entry in self.client.beta.messages.batches.results(batch.id, betas=BETAS):
+                    task = by_id.get(entry.custom_id)
+                    if task is None:
+                        continue
+                    answered.add(entry.custom_id)
+                    if self._handle_result(task, entry.result, downloads):
+                        continuing.append(task)
+
+                for task in pending:
+                    if task.custom_id not in answered:
+                        task.error = RuntimeError(f"批次 {batch.id} 中缺少 {task.custom_id} 的结果")
+                pending = continuing
+
+            results = []
+            for task in tasks:
+                try:
+                    files = [future.result() for future in task.downloads]
+                except Exception as e:
+                    results.append(JobResult(task.job, task.response, error=task.error or e))
+                    continue
+                results.append(JobResult(task.job, task.response, files, error=task.error))
+        finally:
+            downloads.shutdown()
+        return results
+
+
+def _format_counts(batch) -> str:
+    counts = getattr(batch, "request_counts", None)
+    if counts is None:
+        return ""
+    return (f"(处理中 {counts.processing}, 成功 {counts.succeeded}, 失败 {counts.errored}, "
+            f"取消 {counts.canceled}, 过期 {counts.expired})")
+
+
+def main():
+    jobs = [
+        SkillJob(
+            f"创建一份 {month} 月的 PDF 月度销售报告，包含销售额汇总、地区分布表格和简要分析",
+            [anthropic_skill("pdf")],
+            output=f"monthly_report_{month:02d}.pdf",
+        )
+        for month in (1, 2, 3)
+    ]
+
+    results = SkillBatchRunner(output_dir="reports").run(jobs)
+    for result in results:
+        if result.ok:
+            print(f"🎉 {result.job.name}: {len(result.files)} 个文件")
+        else:
+            print(f"❌ {result.job.name}: {result.error}")
+
+
+if __name__ == "__main__":
+    print("🚀 通过 Message Batches 批量生成文档...")
+    main()
@@ -0,0 +1,136 @@
+"""
+Files API 下载管理：并行、流式写盘、按 file_id 去重、失败续传
+
+- 同一个 file_id 只下载一次：后续轮次再次出现时直接返回已有的下载任务
+- 响应体按 chunk_size 分块写入 <文件名>.part，内存占用与文件大小无关，
+  完成后原子地重命名为目标文件
+- 多个文件在线程池中并发下载，共享同一个 client（同一个连接池）
+- 传输中断或遇到可重试错误（429/5xx/连接错误）时按指数退避重试；本次下载中
+  已写入的部分通过 Range 请求续传，服务端不支持 Range 时从头重新下载
+
+用法：
+
+    manager = DownloadManager(client)
+    future = manager.submit(file_id, "report.pdf")
+    path = future.result()
+    manager.shutdown()
+"""
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from anthropic import APIConnectionError, APIStatusError
+
+FILES_BETA = "files-api-2025-04-14"
+
+_RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, APIStatusError):
+        return error.status_code in _RETRYABLE_STATUS
+    return isinstance(error, (APIConnectionError, OSError))
+
+
+class DownloadManager:
+    """并行下载 Files API 中的文件
+
+    workers: 并发下载数
+    max_retries: 每个文件失败后的最多重试次数
+    chunk_size: 每次写盘的块大小（字节）
+    backoff: 第一次重试前的等待秒数，之后每次翻倍（带随机抖动）
+    """
+
+    def __init__(self, client, workers: int = 4, max_retries: int = 3,
+                 chunk_size: int = 1 << 20, backoff: float = 0.5):
+        self.client = client
+        self.workers = workers
+        self.max_retries = max_retries
+        self.chunk_size = chunk_size
+        self.backoff = backoff
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._pool = None
+        self.retries = 0
+
+    def __contains__(self, file_id: str) -> bool:
+        with self._lock:
+            return file_id in self._futures
+
+    def submit(self, file_id: str, path, on_done=None) -> Future:
+        """提交一个下载任务；同一个 file_id 重复提交时返回第一次的 Future
+
+        path: 目标路径，或在工作线程中调用、返回目标路径的函数
+              （例如需要先查询文件元数据才能确定文件名时）
+        on_done: 下载完成后以最终路径调用
+        """
+        with self._lock:
+            future = self._futures.get(file_id)
+            if future is None:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers)
+                future = self._pool.submit(self._fetch, file_id, path, on_done)
+                self._futures[file_id] = future
+            return future
+
+    def download(self, file_id: str, path, on_done=None) -> Path:
+        """同步下载（同样去重）"""
+        return self.submit(file_id, path, on_done).result()
+
+    def _fetch(self, file_id: str, path, on_done) -> Path:
+        path = Path(path() if callable(path) else path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(path.name + ".part")
+        # 磁盘上已有的 .part 可能来自之前崩溃的运行或同名的其他文件，不能续传
+        partial.unlink(missing_ok=True)
+
+        attempt = 0
+        while True:
+            try:
+                self._stream_to(file_id, partial)
+                break
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                attempt += 1
+                self.retries += 1
+                delay = self.backoff * (2 ** (attempt - 1))
+                time.sleep(delay * random.uniform(0.5, 1.0))
+
+        os.replace(partial, path)
+        if on_done is not None:
+            on_done(path)
+        return path
+
+    def _stream_to(self, file_id: str, partial: Path):
+        """把文件流式写入 partial；本次下载已写入部分内容时用 Range 请求续传"""
+        offset = partial.stat().st_size if partial.exists() else 0
+        extra_headers = {"Range": f"bytes={offset}-"} if offset else None
+        with self.client.beta.files.with_streaming_response.download(
+            file_id=file_id,
+            betas=[FILES_BETA],
+            extra_headers=extra_headers,
+        ) as response:
+            # 服务端忽略 Range 时返回完整内容（200），从头写入
+            mode = "ab" if offset and response.status_code == 206 else "wb"
+            with open(partial, mode) as f:
+                try:
+                    for chunk in response.iter_bytes(self.chunk_size):
+                        f.write(chunk)
+                except Exception as e:
+                    # 传输中断：保留已写入的部分，交给上层决定是否续传
+                    raise OSError(f"下载 {file_id} 时连接中断: {e}") from e
+
+    def wait(self) -> list:
+        """等待所有已提交的下载完成，返回路径列表（失败时抛出第一个异常）"""
+        with self._lock:
+            futures = list(self._futures.values())
+        return [future.result() for future in futures]
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
@@ -0,0 +1,132 @@
+"""
+对话历史管理：限制 "继续" 循环中不断增长的上下文
+
+每一轮 agentic loop 都会把完整的 response.content 加入 messages 并重新发送，
+输入 token 随轮数近似平方增长。ConversationHistory 在每次发送前压缩历史：
+
+- 最近 keep_turns 轮保持原样
+- 更早轮次中的大段载荷（代码执行的 stdout/stderr、写入的文件内容、长命令等）
+  截断为 max_chars 字符的摘要；文件本身仍保存在容器中，继续执行不依赖这些文本
+- 超过 max_turns 轮时，丢弃最早的 (assistant, "继续") 对，只保留首条用户指令，
+  并在下一条 "继续" 中注明省略了多少轮
+
+开启 prompt caching（cache_control）时，首条用户指令和最后一条消息带缓存断点，
+下一轮请求可以直接读取之前的前缀。注意被截断的轮次之后的前缀会变化，因此截断只在
+某一轮离开保留窗口时发生一次，其余轮次的缓存保持有效。
+
+同时记录每轮的 token 用量（含缓存读写）和被截断的字符数，便于观察节省的效果。
+"""
+
+CONTINUE_TEXT = "继续"
+
+# 这些字段是 ID 或类型标记，截断会破坏请求结构
+_PROTECTED_KEYS = {"type", "id", "tool_use_id", "file_id", "name", "role", "signature", "encrypted_content"}
+
+
+def _block_to_dict(block):
+    if isinstance(block, dict):
+        return block
+    return block.to_dict()
+
+
+class ConversationHistory:
+    def __init__(self, prompt, keep_turns: int = 2, max_chars: int = 2000, max_turns: int = None,
+                 cache_control: dict = None):
+        self.prompt = prompt
+        self.keep_turns = keep_turns
+        self.max_chars = max_chars
+        self.max_turns = max_turns
+        self.turns = []          # 每轮 assistant 的 content（最近的保持原始对象）
+        self.dropped_turns = 0
+        self.trimmed_chars = 0
+        self.usage = []          # 每轮的 token 用量
+        self.cache_control = cache_control
+
+    def _trim(self, value):
+        """递归截断过长的字符串，返回 (新值, 截掉的字符数)"""
+        if isinstance(value, str):
+            if len(value) > self.max_chars:
+                removed = len(value) - self.max_chars
+                return f"{value[:self.max_chars]}\n...[已省略 {removed} 个字符]", removed
+            return value, 0
+        if isinstance(value, list):
+            removed = 0
+            items = []
+            for item in value:
+                item, n = self._trim(item)
+                items.append(item)
+                removed += n
+            return items, removed
+        if isinstance(value, dict):
+            removed = 0
+            result = {}
+            for key, item in value.items():
+                if key not in _PROTECTED_KEYS:
+                    item, n = self._trim(item)
+                    removed += n
+                result[key] = item
+            return result, removed
+        return value, 0
+
+    def _compact(self, content) -> list:
+        blocks, removed = self._trim([_block_to_dict(block) for block in content])
+        self.trimmed_chars += removed
+        return blocks
+
+    def add_turn(self, response):
+        """记录一轮 assistant 响应，并压缩超出保留窗口的旧轮次"""
+        self.turns.append(response.content)
+
+        # 刚离开保留窗口的那一轮做一次截断（之后不再重复处理）
+        index = len(self.turns) - 1 - self.keep_turns
+        if index >= 0:
+            self.turns[index] = self._compact(self.turns[index])
+
+        if self.max_turns is not None:
+            while len(self.turns) > self.max_turns:
+                self.turns.pop(0)
+                self.dropped_turns += 1
+
+    def record_usage(self, response):
+        """记录一次请求的 token 用量（每个响应调用一次，包括最后一轮）"""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        self.usage.append({
+            "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+            "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+            "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", 0) or 0,
+            "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+        })
+
+    def messages(self) -> list:
+        """构建下一次请求的 messages"""
+        prompt = self.prompt
+        if self.cache_control and isinstance(prompt, str):
+            prompt = [{"type": "text", "text": prompt, "cache_control": self.cache_control}]
+        messages = [{"role": "user", "content": prompt}]
+        for i, content in enumerate(self.turns):
+            messages.append({"role": "assistant", "content": content})
+            text = CONTINUE_TEXT
+            if i == 0 and self.dropped_turns:
+                text = f"（为节省上下文，已省略较早的 {self.dropped_turns} 轮对话，容器中的文件仍然可用）{CONTINUE_TEXT}"
+            messages.append({"role": "user", "content": [{"type": "text", "text": text}]})
+
+        # 最后一条 "继续" 作为移动的缓存断点，下一轮可读取到这里为止的前缀
+        if self.cache_control and len(messages) > 1:
+            messages[-1]["content"][0]["cache_control"] = self.cache_control
+        return messages
+
+    def stats(self) -> dict:
+        """token 用量统计：每轮用量、合计，以及压缩掉的内容（约 4 字符 / token）"""
+        return {
+            "turns": len(self.usage),
+            "per_turn": self.usage,
+            "input_tokens": sum(u["input_tokens"] for u in self.usage),
+            "output_tokens": sum(u["output_tokens"] for u in self.usage),
+            "cache_read_input_tokens": sum(u["cache_read_input_tokens"] for u in self.usage),
+            "cache_creation_input_tokens": sum(u["cache_creation_input_tokens"] for u in self.usage),
+            "dropped_turns": self.dropped_turns,
+            "trimmed_chars": self.trimmed_chars,
+            "estimated_tokens_saved_per_request": self.trimmed_chars // 4,
+        }
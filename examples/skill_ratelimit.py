@@ -0,0 +1,184 @@
+"""
+限流感知的请求调度：在多个并发会话之间共享请求/输入 token 预算
+
+- 按 requests_per_minute / input_tokens_per_minute 维护两个令牌桶，
+  每次请求前按预估的输入 token 数等待，使请求均匀分布而不是集中爆发后被 429
+- 每个响应的 anthropic-ratelimit-* 头用于校准：剩余额度、上限和重置时间
+  都以服务端为准；剩余为 0 时所有会话一起等待到重置时间
+- 429 / 529 / 5xx / 连接错误按带抖动的指数退避重试，服务端给出 retry-after 时
+  至少等待该时长，并让共享同一调度器的其它会话也暂停
+
+用法：
+
+    scheduler = RateScheduler(requests_per_minute=50, input_tokens_per_minute=40000)
+    sessions = [SkillSession(skills, scheduler=scheduler) for ...]
+"""
+import random
+import threading
+import time
+from datetime import datetime
+from anthropic import APIConnectionError, APIStatusError
+
+_RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+def _parse_reset(value: str):
+    """anthropic-ratelimit-*-reset 是 RFC 3339 时间，转换为距现在的秒数"""
+    try:
+        reset = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    return max(0.0, reset.timestamp() - time.time())
+
+
+def _header_int(headers, name: str):
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class _Bucket:
+    """每分钟 limit 个单位、匀速补充的令牌桶"""
+
+    def __init__(self, limit: int = None):
+        self.limit = limit
+        self.level = float(limit) if limit else 0.0
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        if self.limit:
+            self.level = min(self.limit, self.level + (now - self.updated) * self.limit / 60.0)
+        self.updated = now
+
+    def wait_for(self, amount: float) -> float:
+        """还需要等待多少秒才能取出 amount；未配置上限时不等待"""
+        if not self.limit:
+            return 0.0
+        amount = min(amount, self.limit)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) * 60.0 / self.limit
+
+    def observe(self, limit, remaining):
+        if limit:
+            if not self.limit:
+                self.level = float(limit)
+            self.limit = limit
+        if remaining is not None and self.limit:
+            self.level = min(self.level, float(remaining))
+
+
+class RateScheduler:
+    """线程安全的请求调度器，可以在 run_sessions 的多个会话之间共享
+
+    requests_per_minute / input_tokens_per_minute: 初始预算；为 None 时从响应头学习
+    max_retries: 可重试错误的最多重试次数（使用调度器时应关闭 SDK 自身的重试）
+    base_delay / max_delay: 指数退避的初始和最大等待秒数
+    """
+
+    def __init__(self, requests_per_minute: int = None, input_tokens_per_minute: int = None,
+                 max_retries: int = 6, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.requests = _Bucket(requests_per_minute)
+        self.tokens = _Bucket(input_tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.waited = 0.0
+
+    def acquire(self, tokens: int = 0):
+        """阻塞直到预算允许发送一个预估 tokens 个输入 token 的请求"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.requests.refill(now)
+                self.tokens.refill(now)
+                delay = max(self._paused_until - now,
+                            self.requests.wait_for(1),
+                            self.tokens.wait_for(tokens))
+                if delay <= 0:
+                    self.requests.level -= 1
+                    self.tokens.level -= tokens
+                    return
+                self.waited += delay
+            time.sleep(delay)
+
+    def settle(self, estimated: int, actual: int):
+        """用实际输入 token 数修正预估值"""
+        with self._lock:
+            self.tokens.level -= actual - estimated
+
+    def pause(self, seconds: float):
+        """让所有共享此调度器的请求至少等待 seconds 秒"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def observe(self, headers):
+        """根据响应头校准预算"""
+        if headers is None:
+            return
+        with self._lock:
+            self.requests.observe(
+                _header_int(headers, "anthropic-ratelimit-requests-limit"),
+                _header_int(headers, "anthropic-ratelimit-requests-remaining"),
+            )
+            prefix = "anthropic-ratelimit-input-tokens"
+            if headers.get(f"{prefix}-limit") is None:
+                prefix = "anthropic-ratelimit-tokens"
+            self.tokens.observe(
+                _header_int(headers, f"{prefix}-limit"),
+                _header_int(headers, f"{prefix}-remaining"),
+            )
+        # 额度已用完：所有会话一起等到重置时间
+        for name in ("anthropic-ratelimit-requests", prefix):
+            if _header_int(headers, f"{name}-remaining") == 0:
+                reset = _parse_reset(headers.get(f"{name}-reset"))
+                if reset:
+                    self.pause(reset)
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """带抖动的指数退避；服务端给出 retry-after 时至少等待该时长"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        response = getattr(error, "response", None)
+        if response is not None:
+            self.observe(response.headers)
+            try:
+                retry_after = float(response.headers.get("retry-after"))
+            except (TypeError, ValueError):
+                retry_after = None
+            if retry_after is not None:
+                self.pause(retry_after)
+                delay = max(delay, retry_after)
+        return delay
+
+    def run(self, request, estimated_tokens: int = 0):
+        """在预算内执行 request()，可重试的错误按退避重试"""
+        attempt = 0
+        while True:
+            self.acquire(estimated_tokens)
+            try:
+                return request()
+            except (APIStatusError, APIConnectionError) as e:
+                if isinstance(e, APIStatusError) and e.status_code not in _RETRYABLE_STATUS:
+                    raise
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt, e)
+                attempt += 1
+                with self._lock:
+                    self.retries += 1
+                    self.waited += delay
+                time.sleep(delay)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "retries": self.retries,
+                "waited_s": round(self.waited, 3),
+                "requests_per_minute": self.requests.limit,
+                "input_tokens_per_minute": self.tokens.limit,
+            }
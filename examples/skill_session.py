@@ -0,0 +1,344 @@
+"""
+Skill 会话公共库：封装各示例脚本中重复的 agentic loop 和文件提取逻辑
+
+- 所有会话共享同一个 Anthropic client（同一个 HTTP 连接池，keep-alive 复用连接）
+- SkillSession 负责 "请求 -> 打印文本 -> 下载文件 -> 继续" 的完整循环
+- 可调参数：max_retries（SDK 重试次数）、run_sessions 的 concurrency（并发会话数）、
+  stream（流式输出）、输出文件名、以及 on_text / on_text_delta / on_file 回调
+- 历史由 ConversationHistory 管理：旧轮次的大段工具输出会被截断，可选限制保留轮数，
+  并记录每轮 token 用量（session.history.stats()）
+- Prompt caching：system、tools 声明、首条指令和最近一条消息打上 cache_control 断点，
+  后续轮次（以及相同前缀的其它任务）直接命中缓存；容器 ID 在轮次之间复用
+- stream=True 时文本增量实时输出；一旦某个 code execution 结果块带有 file_id，
+  立即在后台线程开始下载，与剩余的生成过程并行
+- 传入共享的 RateScheduler 时，请求按 RPM / 输入 TPM 预算排队，并根据限流响应头校准，
+  429 / 529 等错误按带抖动的指数退避重试（见 skill_ratelimit.py）
+- 文件下载由 DownloadManager 负责：按 file_id 去重、流式写盘、并发下载、失败续传
+
+用法：
+
+    session = SkillSession([anthropic_skill("xlsx")], output="sales_report.xlsx", stream=True)
+    session.run("创建一个 Excel 销售报表 ...")
+"""
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from dotenv import load_dotenv
+from anthropic import Anthropic
+from skill_downloads import FILES_BETA, DownloadManager
+from skill_history import ConversationHistory
+from skill_ratelimit import RateScheduler
+
+load_dotenv()
+
+# 必需的 beta headers
+BETAS = [
+    "code-execution-2025-08-25",
+    "skills-2025-10-02",
+    "files-api-2025-04-14",
+]
+
+MODEL = "claude-3-7-sonnet-20250219"
+
+CODE_EXECUTION_TOOL = {"type": "code_execution_20250825", "name": "code_execution"}
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> Anthropic:
+    """返回进程内共享的 Anthropic client（复用同一个连接池）"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = Anthropic()
+        return _client
+
+
+def anthropic_skill(skill_id: str, version: str = "latest") -> dict:
+    """官方 Skill，例如 pptx、xlsx、docx、pdf"""
+    return {"type": "anthropic", "skill_id": skill_id, "version": version}
+
+
+def custom_skill(skill_id: str, version: str = "latest") -> dict:
+    """通过 upload_custom_skill.py 上传的自定义 Skill"""
+    return {"type": "custom", "skill_id": skill_id, "version": version}
+
+
+def iter_file_ids(block):
+    """从 bash_code_execution_tool_result 中提取 file_id"""
+    if hasattr(block, "content") and hasattr(block.content, "content"):
+        inner_content = block.content.content
+        if isinstance(inner_content, list):
+            for item in inner_content:
+                if getattr(item, "file_id", None):
+                    yield item.file_id
+
+
+class SkillSession:
+    """一次 Skill 对话：持续请求直到 stop_reason == "end_turn"，并保存生成的文件
+
+    output: 保存文件名；为 None 时使用 Files API 中的原始文件名。
+            同一会话生成多个文件时，后续文件加 _2、_3 后缀。
+    filename_pattern: 可选正则，从执行结果的 stdout 中提取文件名（优先于 output）
+    max_retries: SDK 对可重试错误的重试次数（共享连接池，不会新建连接）
+    stream: 使用流式响应，on_text_delta 实时收到文本增量，文件在流中途即开始下载
+    download_workers: 并行下载文件的线程数；download_retries: 每个文件失败后的重试次数
+    keep_turns / max_chars / max_history_turns: 历史压缩参数，见 ConversationHistory
+    system: 可选的 system 提示（稳定前缀的一部分）
+    cache: 为稳定前缀加 cache_control 断点；cache_ttl 可设为 "1h"（默认 5 分钟）
+    reuse_container: 后续轮次复用第一轮返回的容器 ID
+    scheduler: 可在多个会话间共享的 RateScheduler；使用时默认关闭 SDK 自身的重试
+    """
+
+    def __init__(self, skills: list, output: str = None, client: Anthropic = None,
+                 model: str = MODEL, max_tokens: int = 16000, max_retries: int = None,
+                 output_dir: str = ".", filename_pattern: str = None, stream: bool = False,
+                 download_workers: int = 4, download_retries: int = 3, keep_turns: int = 2,
+                 max_chars: int = 2000, max_history_turns: int = None, system: str = None, cache: bool = True,
+                 cache_ttl: str = None, reuse_container: bool = True,
+                 scheduler: RateScheduler = None, on_text=None, on_text_delta=None, on_file=None):
+        client = client or get_client()
+        if max_retries is None and scheduler is not None:
+            max_retries = 0
+        if max_retries is not None:
+            client = client.with_options(max_retries=max_retries)
+        self.client = client
+        self.skills = skills
+        self.output = output
+        self.model = model
+        self.max_tokens = max_tokens
+        self.output_dir = Path(output_dir)
+        self.filename_pattern = re.compile(filename_pattern) if filename_pattern else None
+        self.streaming = stream
+        # 流式模式下默认逐段打印增量，非流式模式下默认打印整段文本
+        self._print_deltas = stream and on_text_delta is None
+        if on_text is None and not stream:
+            on_text = lambda text: print(f"Claude: {text}")
+        self.on_text = on_text
+        self.on_text_delta = on_text_delta or (lambda text: print(text, end="", flush=True))
+        self.on_file = on_file or (lambda path: print(f"✅ 文件已保存: {path}"))
+        self.download_workers = download_workers
+        self.download_retries = download_retries
+        self._reset_downloads()
+        self.keep_turns = keep_turns
+        self.max_chars = max_chars
+        self.max_history_turns = max_history_turns
+        self.history = None
+        self.system = system
+        self.cache_control = None
+        if cache:
+            self.cache_control = {"type": "ephemeral"}
+            if cache_ttl:
+                self.cache_control["ttl"] = cache_ttl
+        self.reuse_container = reuse_container
+        self.container_id = None
+        self.scheduler = scheduler
+
+    def _request_params(self, messages: list) -> dict:
+        """构建请求参数；稳定前缀（tools、system）在开启缓存时带 cache_control"""
+        container = {"skills": self.skills}
+        if self.container_id:
+            container["id"] = self.container_id
+        tool = dict(CODE_EXECUTION_TOOL)
+        if self.cache_control:
+            tool["cache_control"] = self.cache_control
+        params = {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "betas": BETAS,
+            "container": container,
+            "tools": [tool],
+            "messages": messages,
+        }
+        if self.system:
+            system_block = {"type": "text", "text": self.system}
+            if self.cache_control:
+                system_block["cache_control"] = self.cache_control
+            params["system"] = [system_block]
+        return params
+
+    def _remember_container(self, response):
+        container = getattr(response, "container", None)
+        if self.reuse_container and container is not None and getattr(container, "id", None):
+            self.container_id = container.id
+
+    def _estimated_tokens(self) -> int:
+        """下一轮请求的输入 token 预估：上一轮的输入加输出（首轮按提示长度估算）"""
+        if self.history is None:
+            return 0
+        if self.history.usage:
+            last = self.history.usage[-1]
+            return last["input_tokens"] + last["cache_creation_input_tokens"] + last["output_tokens"]
+        return len(str(self.history.prompt)) // 4
+
+    def _scheduled(self, request):
+        """通过调度器发送请求，并用实际用量修正预估"""
+        estimated = self._estimated_tokens()
+        response = self.scheduler.run(request, estimated)
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            actual = (usage.input_tokens or 0) + (getattr(usage, "cache_creation_input_tokens", 0) or 0)
+            self.scheduler.settle(estimated, actual)
+        return response
+
+    def create(self, messages: list):
+        """发送一轮请求"""
+        params = self._request_params(messages)
+        if self.scheduler is None:
+            return self.client.beta.messages.create(**params)
+
+        def request():
+            raw = self.client.beta.messages.with_raw_response.create(**params)
+            self.scheduler.observe(raw.headers)
+            return raw.parse()
+
+        return self._scheduled(request)
+
+    def stream_turn(self, messages: list):
+        """流式发送一轮请求，返回完整的最终响应
+
+        文本增量交给 on_text_delta；content block 结束时如果带有 file_id，
+        立即提交到后台下载，不等整轮生成结束。
+        """
+        params = self._request_params(messages)
+        if self.scheduler is None:
+            return self._stream(params)
+        return self._scheduled(lambda: self._stream(params))
+
+    def _stream(self, params: dict):
+        with self.client.beta.messages.stream(**params) as stream:
+            if self.scheduler is not None:
+                self.scheduler.observe(stream.response.headers)
+            for event in stream:
+                if event.type == "content_block_start" and event.content_block.type == "text":
+                    if self._print_deltas:
+                        print("Claude: ", end="", flush=True)
+                elif event.type == "text":
+                    self.on_text_delta(event.text)
+                elif event.type == "content_block_stop":
+                    block = event.content_block
+                    if block.type == "text":
+                        if self._print_deltas:
+                            print()
+                        if self.on_text:
+                            self.on_text(block.text)
+                    for file_id in iter_file_ids(block):
+                        self._submit_download(block, file_id)
+            return stream.get_final_message()
+
+    def _submit_download(self, block, file_id: str):
+        """提交后台下载；后续轮次中重复出现的 file_id 不会再次下载"""
+        if file_id in self.downloads:
+            return self.downloads.submit(file_id, None)
+        index = self._file_count
+        self._file_count += 1
+        return self.downloads.submit(
+            file_id,
+            lambda: self._output_path(block, file_id, index),
+            on_done=self._saved,
+        )
+
+    def _saved(self, path: Path):
+        self.files.append(path)
+        self.on_file(path)
+
+    def wait_downloads(self):
+        """等待所有后台下载完成（失败时抛出第一个异常）"""
+        try:
+            self.downloads.wait()
+        finally:
+            self.downloads.shutdown()
+
+    def _output_path(self, block, file_id: str, index: int) -> Path:
+        filename = None
+        if self.filename_pattern is not None:
+            stdout = getattr(block.content, "stdout", None)
+            if stdout:
+                matches = self.filename_pattern.findall(stdout)
+                if matches:
+                    filename = matches[-1]
+        if filename is None and self.output:
+            path = Path(self.output)
+            if index > 0:
+                path = path.with_name(f"{path.stem}_{index + 1}{path.suffix}")
+            filename = str(path)
+        if filename is None:
+            metadata = self.client.beta.files.retrieve_metadata(file_id=file_id, betas=[FILES_BETA])
+            filename = Path(metadata.filename).name
+        return self.output_dir / filename
+
+    def download(self, block, file_id: str) -> Path:
+        """下载一个生成的文件并等待完成（已下载过的 file_id 直接返回路径）"""
+        return self._submit_download(block, file_id).result()
+
+    def handle_response(self, response):
+        """处理响应内容：输出文本，文件提交到后台并行下载"""
+        for block in response.content:
+            if block.type == "text" and self.on_text:
+                self.on_text(block.text)
+            for file_id in iter_file_ids(block):
+                self._submit_download(block, file_id)
+
+    def _reset_downloads(self):
+        """每次 run() 使用新的文件列表、编号和 DownloadManager，不带入上一次的结果或失败"""
+        self.files = []
+        self._file_count = 0
+        self.downloads = DownloadManager(
+            self.client, workers=self.download_workers, max_retries=self.download_retries
+        )
+
+    def run(self, prompt, max_turns: int = None):
+        """运行 agentic loop，返回最后一轮响应"""
+        self._reset_downloads()
+        self.history = ConversationHistory(
+            prompt, self.keep_turns, self.max_chars, self.max_history_turns,
+            cache_control=self.cache_control,
+        )
+        self.container_id = None
+        try:
+            response = self._loop(max_turns)
+        finally:
+            self.wait_downloads()
+        return response
+
+    def _loop(self, max_turns: int = None):
+        turns = 0
+        while True:
+            messages = self.history.messages()
+            if self.streaming:
+                response = self.stream_turn(messages)
+            else:
+                response = self.create(messages)
+                self.handle_response(response)
+            self.history.record_usage(response)
+            self._remember_container(response)
+            turns += 1
+
+            # 检查是否需要继续
+            if response.stop_reason == "end_turn":
+                break
+            if max_turns is not None and turns >= max_turns:
+                break
+
+            # 将 assistant 响应加入消息历史（旧轮次会被压缩），继续对话
+            self.history.add_turn(response)
+
+        return response
+
+
+def run_sessions(jobs: list, concurrency: int = 4) -> list:
+    """并发运行多个 (SkillSession, prompt) 任务，共享同一个连接池
+
+    返回与 jobs 顺序一致的结果列表，失败的任务对应位置为异常对象。
+    """
+    def run_one(job):
+        session, prompt = job
+        try:
+            return session.run(prompt)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(run_one, jobs))
@@ -1,9 +1,24 @@
 """
 上传/更新自定义 Skill 到 Anthropic API
+
+每次上传成功后，在本地清单（manifest）中记录每个文件的 sha256。
+update 时先与清单比较：目录没有变化则不创建新版本，有变化时列出新增、修改和删除的文件。
+__pycache__、*.pyc、编辑器临时文件等不会被上传。
+
+所有 API 请求通过共享的 SkillsClient 发送（keep-alive 连接池、分页预取、元数据缓存）。
 """
 import os
 import sys
+import json
+import hashlib
+import uuid
+import fnmatch
+import zipfile
+import tempfile
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -12,110 +27,409 @@ load_dotenv()
 API_KEY = os.environ.get("ANTHROPIC_API_KEY")
 BASE_URL = "https://api.anthropic.com/v1/skills"
 
+MANIFEST_FILE = Path(os.environ.get(
+    "SKILL_MANIFEST",
+    Path.home() / ".cache" / "skill-upload" / "manifest.json",
+))
 
-def upload_skill(skill_dir: str, display_title: str) -> dict:
-    """上传新的自定义 Skill"""
-    skill_path = Path(skill_dir)
+# Skill / 版本元数据缓存（ETag + TTL）
+METADATA_CACHE_FILE = Path(os.environ.get(
+    "SKILL_METADATA_CACHE",
+    Path.home() / ".cache" / "skill-upload" / "metadata.json",
+))
+
+# 单次上传的文件总大小上限
+MAX_UPLOAD_BYTES = 8 * 1024 * 1024
+
+# 不上传的目录和文件
+IGNORED_DIRS = {"__pycache__", ".git", ".pytest_cache", ".mypy_cache", ".ruff_cache", ".idea", ".vscode"}
+IGNORED_PATTERNS = ["*.pyc", "*.pyo", "*.swp", "*.swo", "*~", ".#*", "#*#", "*.tmp", "*.bak",
+                    ".DS_Store", "Thumbs.db"]
+
+
+def is_ignored(relative_path: Path) -> bool:
+    """判断文件是否属于缓存、编译产物或编辑器临时文件"""
+    if any(part in IGNORED_DIRS for part in relative_path.parts[:-1]):
+        return True
+    return any(fnmatch.fnmatch(relative_path.name, pattern) for pattern in IGNORED_PATTERNS)
+
+
+def iter_skill_files(skill_path: Path):
+    """按路径顺序返回需要上传的文件：(上传路径, 本地路径)
+
+    上传路径相对于 Skill 目录的父目录，即以 Skill 目录名开头。
+    """
+    for file_path in sorted(skill_path.rglob("*")):
+        if file_path.is_file() and not is_ignored(file_path.relative_to(skill_path)):
+            yield str(file_path.relative_to(skill_path.parent)), file_path
+
+
+def file_sha256(file_path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_skill_tree(skill_dir: str) -> dict:
+    """Skill 目录中每个待上传文件的 sha256：{上传路径: hash}"""
+    return {name: file_sha256(path) for name, path in iter_skill_files(Path(skill_dir))}
+
+
+def load_manifest() -> dict:
+    try:
+        return json.loads(MANIFEST_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest_entry(skill_id: str, version, hashes: dict):
+    """记录 skill_id 最新上传版本的文件 hash"""
+    manifest = load_manifest()
+    manifest[skill_id] = {"version": version, "files": hashes}
+    MANIFEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = MANIFEST_FILE.with_name(MANIFEST_FILE.name + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, MANIFEST_FILE)
 
-    files_to_upload = []
-    for file_path in skill_path.rglob("*"):
-        if file_path.is_file():
-            relative_path = file_path.relative_to(skill_path.parent)
-            files_to_upload.append(
-                ("files[]", (str(relative_path), open(file_path, "rb")))
-            )
-
-    headers = {
-        "x-api-key": API_KEY,
-        "anthropic-version": "2023-06-01",
-        "anthropic-beta": "skills-2025-10-02",
+
+def diff_hashes(old: dict, new: dict) -> dict:
+    """比较两份 {路径: hash}，返回新增、修改、删除的文件列表"""
+    return {
+        "added": sorted(set(new) - set(old)),
+        "changed": sorted(name for name in set(new) & set(old) if new[name] != old[name]),
+        "removed": sorted(set(old) - set(new)),
     }
 
-    response = requests.post(
-        BASE_URL,
-        headers=headers,
-        data={"display_title": display_title},
-        files=files_to_upload,
-    )
 
-    for _, (_, f) in files_to_upload:
-        f.close()
+def skill_changes(skill_id: str, skill_dir: str):
+    """与清单中记录的版本比较，返回 (当前 hash, 变化)；清单中没有记录时变化为 None"""
+    hashes = hash_skill_tree(skill_dir)
+    entry = load_manifest().get(skill_id)
+    if entry is None:
+        return hashes, None
+    return hashes, diff_hashes(entry.get("files", {}), hashes)
+
+
+class MultipartStream:
+    """流式 multipart/form-data 请求体
+
+    文件在迭代到时才打开，读完立即关闭，同一时刻最多只有一个文件句柄；
+    请求体按 chunk_size 分块产生，不会整体缓存在内存中。
+    实现了 __len__，requests 会据此设置 Content-Length 而不是使用分块传输。
+
+    files: [(上传文件名, 本地路径或可 seek 的二进制文件对象), ...]
+    """
+
+    def __init__(self, fields: dict, files: list, file_field: str = "files[]",
+                 chunk_size: int = 64 * 1024):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.chunk_size = chunk_size
+        self._parts = []
+        for name, value in fields.items():
+            self._parts.append((self._header(name), str(value).encode("utf-8"), None))
+        for filename, source in files:
+            size = _source_size(source)
+            self._parts.append((self._header(file_field, filename), source, size))
+        self._closing = f"--{self.boundary}--\r\n".encode()
+
+    def _header(self, name: str, filename: str = None) -> bytes:
+        disposition = f'form-data; name="{_quote(name)}"'
+        lines = [f"--{self.boundary}"]
+        if filename is None:
+            lines.append(f"Content-Disposition: {disposition}")
+        else:
+            lines.append(f'Content-Disposition: {disposition}; filename="{_quote(filename)}"')
+            lines.append("Content-Type: application/octet-stream")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8")
+
+    @property
+    def file_bytes(self) -> int:
+        """文件内容的总字节数（不含 multipart 头）"""
+        return sum(size for _, _, size in self._parts if size is not None)
+
+    def __len__(self) -> int:
+        total = len(self._closing)
+        for header, body, size in self._parts:
+            total += len(header) + (len(body) if size is None else size) + 2
+        return total
+
+    def __iter__(self):
+        for header, body, size in self._parts:
+            yield header
+            if size is None:
+                yield body
+            else:
+                yield from self._read(body, size)
+            yield b"\r\n"
+        yield self._closing
+
+    def _read(self, source, size: int):
+        if isinstance(source, Path):
+            f = open(source, "rb")
+        else:
+            f = source
+            f.seek(0)
+        try:
+            sent = 0
+            for chunk in iter(lambda: f.read(self.chunk_size), b""):
+                sent += len(chunk)
+                yield chunk
+        finally:
+            if isinstance(source, Path):
+                f.close()
+        if sent != size:
+            raise RuntimeError(f"文件在上传过程中被修改: {source}")
+
+
+def _quote(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+
+
+def _source_size(source) -> int:
+    if isinstance(source, Path):
+        return source.stat().st_size
+    position = source.seek(0, os.SEEK_END)
+    source.seek(0)
+    return position
+
+
+def pack_skill(skill_path: Path):
+    """把 Skill 目录打包为一个 zip（deflate 压缩），返回 (压缩包文件名, 文件对象)
 
-    response.raise_for_status()
-    return response.json()
+    压缩包较小时留在内存中，超过 8MB 时自动落盘为临时文件。
+    """
+    archive = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, file_path in iter_skill_files(skill_path):
+            zf.write(file_path, name)
+    return f"{skill_path.name}.zip", archive
 
 
-def update_skill(skill_id: str, skill_dir: str) -> dict:
-    """更新已有的自定义 Skill（创建新版本）"""
+class SkillsClient:
+    """Skills 管理 API 客户端
+
+    - 所有请求共享一个 keep-alive 的 requests.Session（同一个连接池）
+    - iter_skills() 惰性遍历所有分页，处理当前页时在后台预取下一页
+    - Skill 和版本的元数据带 ETag 缓存：ttl 秒内直接使用缓存，过期后用
+      If-None-Match 重新验证（304 时不重新下载）；缓存保存在磁盘上，
+      重复运行的部署脚本也能复用
+    """
+
+    def __init__(self, api_key: str = None, base_url: str = BASE_URL, ttl: float = 300.0,
+                 cache_file: Path = METADATA_CACHE_FILE):
+        self.base_url = base_url
+        self.ttl = ttl
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.session = requests.Session()
+        self.session.headers.update({
+            "x-api-key": api_key or API_KEY,
+            "anthropic-version": "2023-06-01",
+            "anthropic-beta": "skills-2025-10-02",
+        })
+        self._cache = self._load_cache()
+        self._cache_lock = threading.Lock()
+
+    def close(self):
+        self.session.close()
+
+    def _load_cache(self) -> dict:
+        if self.cache_file is None:
+            return {}
+        try:
+            return json.loads(self.cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self):
+        if self.cache_file is None:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_file.with_name(self.cache_file.name + ".tmp")
+        tmp.write_text(json.dumps(self._cache, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.cache_file)
+
+    def invalidate(self, skill_id: str):
+        """丢弃某个 Skill 的缓存（上传新版本后调用）"""
+        prefix = f"{self.base_url}/{skill_id}"
+        with self._cache_lock:
+            for url in [url for url in self._cache if url == prefix or url.startswith(prefix + "/")]:
+                del self._cache[url]
+            self._save_cache()
+
+    def _get_cached(self, url: str) -> dict:
+        """带 ETag/TTL 缓存的 GET"""
+        with self._cache_lock:
+            entry = self._cache.get(url)
+        if entry is not None and time.time() - entry["fetched_at"] < self.ttl:
+            return entry["body"]
+
+        headers = {}
+        if entry is not None and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        response = self.session.get(url, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            body = entry["body"]
+            etag = entry.get("etag")
+        else:
+            response.raise_for_status()
+            body = response.json()
+            etag = response.headers.get("ETag")
+
+        with self._cache_lock:
+            self._cache[url] = {"etag": etag, "body": body, "fetched_at": time.time()}
+            self._save_cache()
+        return body
+
+    def get_skill(self, skill_id: str) -> dict:
+        """获取 Skill 详情"""
+        return self._get_cached(f"{self.base_url}/{skill_id}")
+
+    def get_skill_version(self, skill_id: str, version: str) -> dict:
+        """获取 Skill 某个版本的详情"""
+        return self._get_cached(f"{self.base_url}/{skill_id}/versions/{version}")
+
+    def _list_page(self, params: dict) -> dict:
+        response = self.session.get(self.base_url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def iter_skills(self, limit: int = 20, source: str = None):
+        """惰性遍历所有 Skills；处理当前页时在后台预取下一页"""
+        params = {"limit": limit}
+        if source:
+            params["source"] = source
+        with ThreadPoolExecutor(max_workers=1) as prefetch:
+            page = self._list_page(params)
+            while True:
+                next_page = None
+                if page.get("has_more") and page.get("next_page"):
+                    next_page = prefetch.submit(self._list_page, {**params, "page": page["next_page"]})
+                yield from page.get("data", [])
+                if next_page is None:
+                    return
+                page = next_page.result()
+
+    def post_skill_files(self, url: str, skill_path: Path, fields: dict = None, archive: bool = False,
+                         max_bytes: int = MAX_UPLOAD_BYTES) -> dict:
+        """以流式 multipart 请求上传 Skill 目录；发送前检查总大小"""
+        packed = None
+        if archive:
+            packed = pack_skill(skill_path)
+            files = [packed]
+        else:
+            files = list(iter_skill_files(skill_path))
+
+        try:
+            body = MultipartStream(fields or {}, files)
+            if body.file_bytes > max_bytes:
+                raise ValueError(
+                    f"Skill 文件总大小 {body.file_bytes / 1024 / 1024:.1f}MB "
+                    f"超过上限 {max_bytes / 1024 / 1024:.1f}MB"
+                )
+            response = self.session.post(url, headers={"Content-Type": body.content_type}, data=body)
+        finally:
+            if packed is not None:
+                packed[1].close()
+
+        response.raise_for_status()
+        return response.json()
+
+
+_skills_client = None
+
+
+def get_skills_client() -> SkillsClient:
+    """返回进程内共享的 SkillsClient"""
+    global _skills_client
+    if _skills_client is None:
+        _skills_client = SkillsClient()
+    return _skills_client
+
+
+def upload_skill(skill_dir: str, display_title: str, archive: bool = False) -> dict:
+    """上传新的自定义 Skill
+
+    archive=True 时把目录打包为单个 zip 上传，以减少请求体大小。
+    """
     skill_path = Path(skill_dir)
+    hashes = hash_skill_tree(skill_dir)
+
+    client = get_skills_client()
+    result = client.post_skill_files(
+        client.base_url,
+        skill_path,
+        fields={"display_title": display_title},
+        archive=archive,
+    )
+    save_manifest_entry(result.get("id"), result.get("latest_version"), hashes)
+    return result
 
-    files_to_upload = []
-    for file_path in skill_path.rglob("*"):
-        if file_path.is_file():
-            relative_path = file_path.relative_to(skill_path.parent)
-            files_to_upload.append(
-                ("files[]", (str(relative_path), open(file_path, "rb")))
-            )
-
-    headers = {
-        "x-api-key": API_KEY,
-        "anthropic-version": "2023-06-01",
-        "anthropic-beta": "skills-2025-10-02",
-    }
+
+def update_skill(skill_id: str, skill_dir: str, force: bool = False, archive: bool = False) -> dict:
+    """更新已有的自定义 Skill（创建新版本）
+
+    目录内容与清单中记录的上次上传完全相同时不创建新版本，返回 None；
+    force=True 时总是上传。archive 同 upload_skill。
+    """
+    hashes, changes = skill_changes(skill_id, skill_dir)
+    if changes is not None and not force and not any(changes.values()):
+        return None
 
     # POST to /v1/skills/{skill_id}/versions 创建新版本
-    response = requests.post(
-        f"{BASE_URL}/{skill_id}/versions",
-        headers=headers,
-        files=files_to_upload,
-    )
+    client = get_skills_client()
+    result = client.post_skill_files(f"{client.base_url}/{skill_id}/versions", Path(skill_dir), archive=archive)
+    client.invalidate(skill_id)
+    save_manifest_entry(skill_id, result.get("version"), hashes)
+    return result
 
-    for _, (_, f) in files_to_upload:
-        f.close()
 
-    response.raise_for_status()
-    return response.json()
+def print_changes(changes):
+    if changes is None:
+        print("   本地没有上次上传的记录，将上传全部文件")
+        return
+    for label, key in (("新增", "added"), ("修改", "changed"), ("删除", "removed")):
+        for name in changes[key]:
+            print(f"   {label}: {name}")
 
 
 def list_skills() -> dict:
-    """列出所有 Skills"""
-    headers = {
-        "x-api-key": API_KEY,
-        "anthropic-version": "2023-06-01",
-        "anthropic-beta": "skills-2025-10-02",
-    }
-    response = requests.get(BASE_URL, headers=headers)
-    response.raise_for_status()
-    return response.json()
+    """列出所有 Skills（所有分页）"""
+    return {"data": list(get_skills_client().iter_skills())}
 
 
 def get_skill(skill_id: str) -> dict:
-    """获取 Skill 详情"""
-    headers = {
-        "x-api-key": API_KEY,
-        "anthropic-version": "2023-06-01",
-        "anthropic-beta": "skills-2025-10-02",
-    }
-    response = requests.get(f"{BASE_URL}/{skill_id}", headers=headers)
-    response.raise_for_status()
-    return response.json()
+    """获取 Skill 详情（带缓存）"""
+    return get_skills_client().get_skill(skill_id)
 
 
 def main():
     skill_dir = Path(__file__).parent.parent / "custom_skills" / "resume-gen"
     skill_id = "skill_01YAhbM32hbu6grvV1MLnssA"  # 已上传的 skill_id
 
-    # 检查命令行参数
+    # 检查命令行参数（--zip 打包为单个压缩包上传）
+    archive = "--zip" in sys.argv[1:]
     if len(sys.argv) > 1 and sys.argv[1] == "update":
-        # 更新模式
+        # 更新模式（--force 忽略清单，总是创建新版本）
+        force = "--force" in sys.argv[2:]
         print(f"🔄 更新 Skill: {skill_id}")
         print(f"   目录: {skill_dir}")
+        _, changes = skill_changes(skill_id, str(skill_dir))
+        print_changes(changes)
         print()
 
         try:
-            result = update_skill(skill_id, str(skill_dir))
+            result = update_skill(skill_id, str(skill_dir), force=force, archive=archive)
+            if result is None:
+                print("✅ 内容没有变化，无需创建新版本")
+                return
             print("✅ 更新成功!")
             print(f"   新版本: {result.get('version')}")
+        except ValueError as e:
+            print(f"❌ 更新失败: {e}")
+            return
         except requests.exceptions.HTTPError as e:
             print(f"❌ 更新失败: {e}")
             if e.response:
@@ -128,12 +442,15 @@ def main():
         print()
 
         try:
-            result = upload_skill(str(skill_dir), "Resume Generator")
+            result = upload_skill(str(skill_dir), "Resume Generator", archive=archive)
             print("✅ 上传成功!")
             print(f"   ID: {result.get('id')}")
             print(f"   Version: {result.get('latest_version')}")
             print()
             print(f"📝 在 use_custom_skill.py 中使用这个 ID: {result.get('id')}")
+        except ValueError as e:
+            print(f"❌ 上传失败: {e}")
+            return
         except requests.exceptions.HTTPError as e:
             print(f"❌ 上传失败: {e}")
             if e.response:
@@ -143,8 +460,7 @@ def main():
     # 列出所有 skills
     print("\n📋 当前所有 Skills:")
     try:
-        skills = list_skills()
-        for skill in skills.get("data", []):
+        for skill in get_skills_client().iter_skills():
             source = "官方" if skill.get('source') == 'anthropic' else "自定义"
             print(f"   - {skill.get('id')} ({source})")
     except Exception as e:
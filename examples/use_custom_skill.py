@@ -2,18 +2,7 @@
 示例：使用自定义 Skill (resume-gen) 生成简历
 上传 Skill 后，在 container.skills 中引用即可使用
 """
-from dotenv import load_dotenv
-from anthropic import Anthropic
-
-load_dotenv()
-
-client = Anthropic()
-
-BETAS = [
-    "code-execution-2025-08-25",
-    "skills-2025-10-02",
-    "files-api-2025-04-14",
-]
+from skill_session import SkillSession, custom_skill
 
 # 上传后获得的 skill_id（运行 upload_custom_skill.py 后填入）
 CUSTOM_SKILL_ID = "skill_01YAhbM32hbu6grvV1MLnssA"
@@ -22,69 +11,21 @@ CUSTOM_SKILL_ID = "skill_01YAhbM32hbu6grvV1MLnssA"
 def generate_resume(user_info: str):
     """使用自定义 Skill 生成简历"""
 
-    messages = [
-        {
-            "role": "user",
-            "content": f"""请根据以下信息帮我生成一份专业的简历 PDF：
+    prompt = f"""请根据以下信息帮我生成一份专业的简历 PDF：
 
 {user_info}
 
 请使用 modern 风格，生成文件名为 my_resume.pdf
 """
-        }
-    ]
-
-    # Agentic loop
-    while True:
-        response = client.beta.messages.create(
-            model="claude-3-7-sonnet-20250219",
-            max_tokens=16000,
-            betas=BETAS,
-            container={
-                "skills": [
-                    # 使用自定义 Skill
-                    {"type": "custom", "skill_id": CUSTOM_SKILL_ID, "version": "latest"}
-                ]
-            },
-            tools=[
-                {"type": "code_execution_20250825", "name": "code_execution"}
-            ],
-            messages=messages,
-        )
-
-        # 处理响应
-        for block in response.content:
-            if block.type == "text":
-                print(f"Claude: {block.text}")
-
-            # 提取生成的 PDF 文件
-            if hasattr(block, "content") and hasattr(block.content, "content"):
-                inner_content = block.content.content
-                if isinstance(inner_content, list):
-                    for item in inner_content:
-                        if hasattr(item, "file_id") and item.file_id:
-                            file_id = item.file_id
-                            file_content = client.beta.files.download(
-                                file_id=file_id,
-                                betas=["files-api-2025-04-14"]
-                            )
-                            filename = "my_resume.pdf"
-                            # 尝试从 stdout 提取文件名
-                            if hasattr(block.content, "stdout") and block.content.stdout:
-                                import re
-                                matches = re.findall(r'([\w\-_]+\.pdf)', block.content.stdout)
-                                if matches:
-                                    filename = matches[-1]
-                            file_content.write_to_file(filename)
-                            print(f"✅ 简历已保存: {filename}")
-
-        if response.stop_reason == "end_turn":
-            break
-
-        messages.append({"role": "assistant", "content": response.content})
-        messages.append({"role": "user", "content": [{"type": "text", "text": "继续"}]})
 
-    return response
+    # 使用自定义 Skill；优先从执行结果的 stdout 中提取文件名
+    session = SkillSession(
+        [custom_skill(CUSTOM_SKILL_ID)],
+        output="my_resume.pdf",
+        filename_pattern=r'([\w\-_]+\.pdf)',
+        stream=True,
+    )
+    return session.run(prompt)
 
 
 if __name__ == "__main__":